@@ -0,0 +1,46 @@
+"""Parsing a large config versus taking it from the in-process and `.nipc` caches.
+
+python benchmarks/bench_cache.py [number_of_blocks]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_parse import generate_config
+from nip import DiskCache, ParseCache, Parser
+
+
+def timed(function, repeats: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "config.nip"
+        path.write_text(generate_config(n_blocks))
+
+        parse_time = timed(lambda: Parser().parse(path))
+        memory_cache = ParseCache()
+        memory_cache.parse(Parser(), path)
+        memory_time = timed(lambda: memory_cache.parse(Parser(), path))
+        disk_cache = DiskCache()
+        disk_cache.parse(Parser(), path)
+        disk_time = timed(lambda: disk_cache.parse(Parser(), path))
+        compiled_size = disk_cache.compiled_path(path).stat().st_size
+
+        print(f"config: {n_blocks} blocks, {path.stat().st_size / 1e6:.1f} MB")
+        print(f"parse:           {parse_time:.3f}s")
+        print(f"in-process hit:  {memory_time:.3f}s ({parse_time / memory_time:.1f}x)")
+        print(f".nipc hit:       {disk_time:.3f}s ({parse_time / disk_time:.1f}x), {compiled_size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
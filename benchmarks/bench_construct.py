@@ -0,0 +1,51 @@
+"""Constructing a small config many times with a large builder registry, as after `wrap_module` of a large module.
+
+Compares constructors that share the builder registry snapshot with ones that copy all the builders
+and look for `NIPBuilder` subclasses on every construction, as before.
+
+python benchmarks/bench_construct.py [number_of_constructions] [number_of_builders]
+"""
+
+import sys
+import time
+
+import nip
+from nip.constructor import NIPBuilder, global_builders
+from nip.non_seq_constructor import NonSequentialConstructor
+from nip.utils import get_sub_dict
+
+CONFIG = """
+data: &data !builder_0
+model:
+  data: *data
+  other: !builder_1
+"""
+
+
+class PreviousConstructor(NonSequentialConstructor):
+    def load_builders(self):
+        self.builders = {}
+        self.builders.update(global_builders)
+        self.builders.update(get_sub_dict(NIPBuilder))
+
+
+def construct_all(config, n_constructions: int, constructor_class) -> float:
+    start = time.perf_counter()
+    for _ in range(n_constructions):
+        constructor_class(config).construct(config)
+    return time.perf_counter() - start
+
+
+def main():
+    n_constructions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    n_builders = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    for i in range(n_builders):
+        nip.nip(f"builder_{i}")(dict)
+    config = nip.parse_string(CONFIG)
+    print(f"{n_constructions} constructions with {len(global_builders)} builders")
+    for name, constructor_class in [("copied builders", PreviousConstructor), ("snapshot", NonSequentialConstructor)]:
+        print(f"  {name + ':':17} {construct_all(config, n_constructions, constructor_class):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
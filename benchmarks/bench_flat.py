@@ -0,0 +1,62 @@
+"""Flat (path, value) pairs of a config tree with 1M leaves.
+
+Compares `flatten` with the previous one, that built the python value first and a key tuple per level,
+and times streaming `iter_flat` and `unflatten`: building a tree of the pairs and setting 1% of them into the tree,
+also as "path=value" strings with `apply_overrides`.
+
+python benchmarks/bench_flat.py [number_of_leaves]
+"""
+
+import sys
+import time
+
+import nip.elements as elements
+import nip.utils
+from bench_walk import large_tree
+
+
+def previous_flatten(obj, delimiter=".", keys=()):
+    result = {}
+    stack = [(keys, obj)]
+    while stack:
+        keys, obj = stack.pop()
+        if not isinstance(obj, (list, tuple, dict)):
+            result[delimiter.join(keys)] = obj
+            continue
+        stack.extend((keys + (str(key),), value) for key, value in reversed(list(nip.utils.iterate_items(obj))))
+    return result
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, f"{time.perf_counter() - start:.3f}s"
+
+
+def main():
+    n_leaves = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tree = large_tree(n_leaves)
+    print(f"{n_leaves} leaves tree")
+    previous, elapsed = timed(lambda: previous_flatten(tree.to_python()))
+    print(f"  previous flatten:         {elapsed}")
+    tree = large_tree(n_leaves)  # without cached python values
+    flat, elapsed = timed(tree.flatten)
+    print(f"  flatten:                  {elapsed}")
+    assert flat == previous
+    _, elapsed = timed(lambda: sum(1 for _ in tree.iter_flat("/")))
+    print(f"  iter_flat:                {elapsed}")
+    built, elapsed = timed(lambda: elements.unflatten(flat.items()))
+    print(f"  unflatten:                {elapsed}")
+    assert built.flatten() == flat
+
+    overrides = [(path, -1) for path in list(flat)[::100]]
+    _, elapsed = timed(lambda: elements.unflatten(overrides, tree=tree))
+    print(f"  unflatten into the tree:  {elapsed} ({len(overrides)} pairs)")
+    _, elapsed = timed(lambda: [tree.__setitem__(path, -2) for path, _ in overrides])
+    print(f"  __setitem__ one by one:   {elapsed}")
+    _, elapsed = timed(lambda: tree.apply_overrides([f"{path}=-3" for path, _ in overrides]))
+    print(f"  apply_overrides strings:  {elapsed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Variants of a parsed config with a few overridden keys.
+
+Compares `fork()` with deep copies of the tree: time and memory of the variants.
+
+python benchmarks/bench_fork.py [number_of_blocks] [number_of_variants]
+"""
+
+import copy
+import sys
+import time
+import tracemalloc
+
+from bench_parse import generate_config
+from nip.parser import Parser
+
+
+def make_variants(tree, n_variants: int, n_blocks: int, copy_tree) -> list:
+    variants = []
+    for i in range(n_variants):
+        variant = copy_tree(tree)
+        variant[f"block_{i % n_blocks}.index"] = -i
+        variant[f"block_{(i * 7) % n_blocks}.layers.0.size"] = i
+        variants.append(variant)
+    return variants
+
+
+def measure(tree, n_variants: int, n_blocks: int, copy_tree):
+    tracemalloc.start()
+    start = time.perf_counter()
+    variants = make_variants(tree, n_variants, n_blocks, copy_tree)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert variants[-1][f"block_{(n_variants - 1) % n_blocks}.index"].to_python() == 1 - n_variants
+    return elapsed, size
+
+
+def main():
+    n_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_variants = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    tree = Parser().parse_string(generate_config(n_blocks))
+    print(f"{n_variants} variants of {n_blocks} blocks config")
+    for name, copy_tree in [("deepcopy", copy.deepcopy), ("fork", lambda tree: tree.fork())]:
+        elapsed, size = measure(tree, n_variants, n_blocks, copy_tree)
+        print(f"  {name + ':':10} {elapsed:.3f}s {size / 2 ** 20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Reading inline collections with `LiteralReader` versus `eval` of the same text.
+
+python benchmarks/bench_inline.py [number_of_vectors]
+"""
+
+import random
+import sys
+import time
+
+import nip
+from nip.tokens import LiteralReader
+
+
+def generate_config(n_vectors: int) -> str:
+    random.seed(0)
+    lines = []
+    for i in range(n_vectors):
+        vector = ", ".join(f"{random.random():.6f}" for _ in range(16))
+        lines.append(f"vector_{i}: [{vector}]")
+        lines.append(f"meta_{i}: {{'id': {i}, 'shape': (4, 4), 'name': 'vector {i}'}}")
+    return "\n".join(lines)
+
+
+def literal_strings(config: str):
+    return [line[line.index(": ") + 2 :] for line in config.split("\n")]
+
+
+def main():
+    n_vectors = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    config = generate_config(n_vectors)
+    literals = literal_strings(config)
+
+    start = time.perf_counter()
+    evaluated = [eval(literal) for literal in literals]
+    eval_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read = []
+    for literal in literals:
+        reader = LiteralReader(literal, 0)
+        reader.read()
+        read.append(reader.value)
+    reader_time = time.perf_counter() - start
+    assert read == evaluated
+
+    print(f"{len(literals)} inline collections")
+    print(f"eval:          {eval_time:.3f}s")
+    print(f"LiteralReader: {reader_time:.3f}s ({eval_time / reader_time:.2f}x)")
+
+    start = time.perf_counter()
+    nip.parse_string(config)
+    print(f"parse of the whole config: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
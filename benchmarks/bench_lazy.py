@@ -0,0 +1,38 @@
+"""Taking one section of a large config with full and lazy parsing.
+
+python benchmarks/bench_lazy.py [number_of_blocks]
+"""
+
+import sys
+import time
+
+from bench_parse import generate_config
+from nip import Parser
+
+
+def timed(function, repeats: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    config = generate_config(n_blocks, links=False)
+    key = "block_0"
+
+    full_time = timed(lambda: Parser().parse_string(config)[key].to_python())
+    lazy_time = timed(lambda: Parser(lazy=True).parse_string(config)[key].to_python())
+    whole_lazy_time = timed(lambda: Parser(lazy=True).parse_string(config).to_python())
+
+    print(f"config: {n_blocks} blocks, {len(config) / 1e6:.1f} MB")
+    print(f"full parse, one section:  {full_time:.3f}s")
+    print(f"lazy parse, one section:  {lazy_time:.3f}s ({full_time / lazy_time:.1f}x)")
+    print(f"lazy parse, all sections: {whole_lazy_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
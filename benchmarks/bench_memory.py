@@ -0,0 +1,88 @@
+"""Memory of parsed config trees and garbage collector work for them.
+
+Compares `__slots__` nodes with strong and with weak (`weak_parents=True`) parent references
+to the previous nodes, that had `__dict__`, strong references to parents and keys of Args copied into `__dict__`.
+
+python benchmarks/bench_memory.py [number_of_trees]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+import nip.elements as elements
+from bench_parse import generate_config
+from nip.parser import Parser
+
+
+class LegacyNode:
+    def __init__(self, name, parent):
+        self._name = name
+        self._value = None
+        self._parent = parent
+
+
+def to_legacy(node: elements.Node, parent: LegacyNode = None) -> LegacyNode:
+    legacy = LegacyNode(node._name, parent)
+    if isinstance(node, elements.Args):
+        args, kwargs = node._value
+        legacy._value = [to_legacy(item, legacy) for item in args], {k: to_legacy(v, legacy) for k, v in kwargs.items()}
+        legacy.__dict__.update(legacy._value[1])
+    elif isinstance(node._value, elements.Node):
+        legacy._value = to_legacy(node._value, legacy)
+    else:
+        legacy._value = node._value
+    return legacy
+
+
+def to_current(node: elements.Node, parent: elements.Node = None) -> elements.Node:
+    copy = node.__class__.__new__(node.__class__)
+    copy._name = node._name
+    copy._parent = parent
+    if isinstance(node, elements.Args):
+        args, kwargs = node._value
+        copy._value = [to_current(item, copy) for item in args], {k: to_current(v, copy) for k, v in kwargs.items()}
+    elif isinstance(node._value, elements.Node):
+        copy._value = to_current(node._value, copy)
+    else:
+        copy._value = node._value
+    return copy
+
+
+def measure(convert, tree: elements.Node, n_trees: int):
+    gc.collect()
+    tracemalloc.start()
+    trees = [convert(tree) for _ in range(n_trees)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    gc.collect()  # full collection has to traverse all the live nodes
+    gc_time = time.perf_counter() - start
+    del trees
+    unreachable = gc.collect()  # dropped trees that were not freed by reference counting
+    return size / 1e6, gc_time, unreachable
+
+
+def to_current_weak(node: elements.Node) -> elements.Node:
+    copy = to_current(node)
+    copy._update_parents(weak=True)
+    return copy
+
+
+def main():
+    n_trees = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    tree = Parser().parse_string(generate_config(100, links=False))
+    print(f"{n_trees} trees of a config with 100 blocks")
+    for name, convert in [
+        ("previous nodes", to_legacy),
+        ("slots nodes", to_current),
+        ("weak parents", to_current_weak),
+    ]:
+        size, gc_time, unreachable = measure(convert, tree, n_trees)
+        print(f"{name:15} {size:7.1f} MB, full gc: {gc_time:.3f}s, left for cyclic gc after drop: {unreachable}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Parsing speed and memory on large generated configs.
+
+Compares `Stream`, that scans a single buffer in place, with the previous stream
+that kept padded copies of the lines and copied the rest of the line for every token read.
+
+    python benchmarks/bench_parse.py [number_of_blocks]
+"""
+
+import mmap
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import nip.tokens as tokens
+from nip.parser import Parser
+from nip.stream import Stream, StreamError
+
+
+def generate_config(n_blocks: int, links: bool = True) -> str:
+    blocks = []
+    for i in range(n_blocks):
+        link_creation = f"&block_{i} " if links else ""
+        link = f"*block_{max(i - 1, 0)}" if links else f"block_{max(i - 1, 0)}"
+        blocks.append(
+            f"block_{i}: {link_creation}!Block  # block number {i}\n"
+            f"  name: block number {i}\n"
+            f"  index: {i}\n"
+            f"  scale: {i * 0.5}\n"
+            f"  enabled: true\n"
+            f"  shape: [{i}, {i + 1}, {i + 2}]\n"
+            f"  options: {{'a': {i}, 'b': 'value'}}\n"
+            f"  layers:\n"
+            f"    - !Layer\n"
+            f"      size: {i % 128}\n"
+            f"    - {link}\n"
+            f'    - "quoted string {i}"\n'
+        )
+    return "\n".join(blocks)
+
+
+class LineStream:
+    """Previous stream: padded copies of all the lines and a copy of the rest of the line per token read."""
+
+    def __init__(self, sstream: str):
+        self.lines = [line + " " for line in sstream.split("\n")]
+        self.n = 0
+        self.pos = 0
+        self.last_peak_pos = -1
+        self._pass_forward()
+
+    def peek(self, *args):
+        if not self:
+            return None
+        line = self.lines[self.n]
+        pos = self.pos
+        self.last_peak_pos = -1
+        read_tokens = []
+        for arg in args:
+            token_type = arg.__class__ if isinstance(arg, tokens.Token) else arg
+            while pos < len(line) and line[pos].isspace():
+                pos += 1
+            if pos >= len(line):
+                return None
+            try:
+                length, token = token_type.read(line[pos:])
+            except tokens.TokenError as e:
+                raise StreamError(self.n, pos, e)
+            if token is None:
+                return None
+            if isinstance(arg, tokens.Token) and token != arg:
+                return None
+            token.set_position(self.n, pos)
+            read_tokens.append(token)
+            pos += length
+        self.last_peak_pos = pos
+        return read_tokens
+
+    def lookahead(self):
+        return self.lines[self.n][self.pos] if self else ""
+
+    def at_line_start(self):
+        return self.lines[self.n][: self.pos].isspace()
+
+    def step(self):
+        self.pos = self.last_peak_pos
+        self._pass_forward()
+
+    def _pass_forward(self):
+        while self and (
+            self.pos >= len(self.lines[self.n])
+            or self.lines[self.n][self.pos :].isspace()
+            or self.lines[self.n][self.pos :].strip()[0] == "#"
+        ):
+            self.n += 1
+            self.pos = 0
+        if not self:
+            return
+        while self.lines[self.n][self.pos].isspace():
+            self.pos += 1
+
+    def __bool__(self):
+        return self.n < len(self.lines)
+
+
+def measure(stream_factory, config, repeats: int = 3):
+    import nip.elements as elements
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        stream = stream_factory(config)
+        parser = Parser()
+        elements.Document.read(stream, parser)
+        best = min(best, time.perf_counter() - start)
+    return best, parser.backtracks
+
+
+def stream_memory(stream_factory, config) -> float:
+    tracemalloc.start()
+    stream = stream_factory(config)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / 1e6
+
+
+def main():
+    n_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    config = generate_config(n_blocks)
+    print(f"config: {n_blocks} blocks, {config.count(chr(10)) + 1} lines, {len(config) / 1e6:.1f} MB")
+    lines, _ = measure(LineStream, config)
+    buffer, backtracks = measure(Stream, config)
+    print(f"line stream:   {lines:.3f}s, {stream_memory(LineStream, config):.1f} MB")
+    print(f"buffer stream: {buffer:.3f}s, {stream_memory(Stream, config):.1f} MB ({lines / buffer:.2f}x faster)")
+    print(f"failed node reader attempts: {backtracks}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "config.nip"
+        path.write_text(config)
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            mapped_time, _ = measure(Stream, mapped)
+    print(f"buffer stream over mmap: {mapped_time:.3f}s")
+
+    start = time.perf_counter()
+    parser = Parser(memoize_tokens=True)
+    parser.parse_string(config)
+    memoized = time.perf_counter() - start
+    print(
+        f"memoized token reads: {memoized:.3f}s, {parser.memo_hits} hits of "
+        f"{parser.memo_hits + parser.memo_misses} reads ({parser.memo_hit_rate:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Constructing the same config many times: `nip.construct` versus a plan compiled once with `nip.compile`.
+
+Blocks of the config refer to the previous ones and have inline python and f-strings.
+
+python benchmarks/bench_plan.py [number_of_constructions] [number_of_blocks]
+"""
+
+import sys
+import time
+
+import nip
+
+
+def generate_config(n_blocks: int) -> str:
+    blocks = ["block_0: &block_0 !Block\n  index: 0\n"]
+    for i in range(1, n_blocks):
+        blocks.append(
+            f"block_{i}: &block_{i} !Block\n"
+            f"  index: {i}\n"
+            f"  scale: `{i} * 0.5`\n"
+            f'  name: f"block {{{i} + 1}}"\n'
+            f"  layers:\n"
+            f"    - !Layer\n"
+            f"      size: {i % 128}\n"
+            f"    - *block_{i - 1}\n"
+        )
+    return "".join(blocks)
+
+
+def timed(function, n_constructions: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n_constructions):
+        function()
+    return time.perf_counter() - start
+
+
+def main():
+    n_constructions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_blocks = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    nip.nip("Block")(dict)
+    nip.nip("Layer")(dict)
+    config = nip.parse_string(generate_config(n_blocks))
+    print(f"{n_constructions} constructions of {n_blocks} blocks config")
+    print(f"  construct: {timed(lambda: nip.construct(config), n_constructions):.3f}s")
+    start = time.perf_counter()
+    plan = nip.compile(config)
+    print(f"  compile:   {time.perf_counter() - start:.3f}s ({len(plan)} steps)")
+    assert plan() == nip.construct(config)
+    print(f"  plan:      {timed(plan, n_constructions):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
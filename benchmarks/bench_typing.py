@@ -0,0 +1,83 @@
+"""Constructing 100k small tagged objects with type checks of their arguments.
+
+Compares the previous `check_typing` (without its `print` of every argument), that got the signature
+of the builder and checked all the items with typeguard for every object, with the cached checkers of each depth.
+
+python benchmarks/bench_typing.py [number_of_objects]
+"""
+
+import gc
+import inspect
+import sys
+import time
+from typing import List
+
+import typeguard
+
+import nip
+import nip.utils
+
+
+@nip.nip("Point")
+class Point:
+    def __init__(self, x: int, y: float, tags: List[str]):
+        self.x = x
+        self.y = y
+        self.tags = tags
+
+
+def previous_check_typing(func, args, kwargs):
+    try:
+        signature = inspect.signature(func)
+    except ValueError:
+        return []
+    messages = []
+    typeguard.typechecked()
+    if len(args) > len(signature.parameters.values()):
+        messages.append("Too many arguments")
+    for arg, param in zip(args, signature.parameters.values()):
+        if param.annotation is inspect.Parameter.empty:
+            continue
+        try:
+            typeguard.check_type(arg, param.annotation)
+        except typeguard.TypeCheckError as e:
+            messages.append(f"{param.name}: {e}")
+    for name, value in kwargs.items():
+        if name not in signature.parameters:
+            continue
+        annotation = signature.parameters[name].annotation
+        if annotation is inspect.Parameter.empty:
+            continue
+        try:
+            typeguard.check_type(value, annotation)
+        except typeguard.TypeCheckError as e:
+            messages.append(f"{name}: {e}")
+    return messages
+
+
+def timed_construct(config, **kwargs) -> float:
+    start = time.perf_counter()
+    nip.construct(config, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    n_objects = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tags = ", ".join(f"'tag_{i}'" for i in range(8))
+    config = nip.parse_string(
+        "".join(f"- !Point\n    x: {i}\n    y: 0.5\n    tags: [{tags}]\n" for i in range(n_objects))
+    )
+    print(f"{n_objects} tagged objects")
+    gc.collect()
+    gc.freeze()  # the parsed tree is not traversed by the collections during construction
+
+    check_typing = nip.utils.check_typing
+    nip.utils.check_typing = lambda func, args, kwargs, depth: previous_check_typing(func, args, kwargs)
+    print(f"  previous check:  {timed_construct(config):.3f}s")
+    nip.utils.check_typing = check_typing
+    for depth in nip.utils.TYPING_DEPTHS:
+        print(f"  {depth + ':':16} {timed_construct(config, typing_depth=depth):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
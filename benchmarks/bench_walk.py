@@ -0,0 +1,76 @@
+"""Tree traversals on a deep and on a large config tree.
+
+Compares `to_python` with the previous recursive implementation and times the other
+traversals that are done with the walker: parents update, links search, dump and flatten.
+Python values of the subtrees are cached after the first `to_python`, the modified leaf invalidates its parents only.
+
+python benchmarks/bench_walk.py [depth] [number_of_nodes]
+"""
+
+import sys
+import time
+
+import nip
+import nip.elements as elements
+from nip.non_seq_constructor import NonSequentialConstructor
+
+
+def deep_tree(depth: int) -> elements.Document:
+    node = elements.Value("", depth)
+    for i in range(depth):
+        node = elements.Args("args", ([], {f"level_{i}": node}))
+    return elements.Document("", node)
+
+
+def large_tree(n_nodes: int) -> elements.Document:
+    width = int(n_nodes**0.5)
+    blocks = {}
+    for i in range(width):
+        items = {f"item_{j}": elements.Value("", j) for j in range(width - 1)}
+        blocks[f"block_{i}"] = elements.Tag("Block", elements.Args("args", ([], items)))
+    return elements.Document("", elements.Args("args", ([], blocks)))
+
+
+def recursive_to_python(node: elements.Node):
+    """Previous `to_python`: a method call per node"""
+    if isinstance(node, elements.Value):
+        return node._value
+    if isinstance(node, elements.Args):
+        args = [recursive_to_python(item) for item in node._value[0]]
+        kwargs = {key: recursive_to_python(value) for key, value in node._value[1].items()}
+        return args or kwargs
+    return recursive_to_python(node._value)
+
+
+def timed(function):
+    start = time.perf_counter()
+    try:
+        function()
+    except RecursionError:
+        return "RecursionError"
+    return f"{time.perf_counter() - start:.3f}s"
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    for name, tree in [(f"{depth}-deep tree", deep_tree(depth)), (f"{n_nodes} nodes tree", large_tree(n_nodes))]:
+        print(name)
+        print(f"  walk:                {timed(lambda: sum(1 for _ in elements.walk(tree, with_paths=True)))}")
+        print(
+            f"  walk post-order:     {timed(lambda: sum(1 for _ in elements.walk(tree, post_order=True, with_paths=True)))}"
+        )
+        print(f"  update parents:      {timed(tree._update_parents)}")
+        print(f"  find links:          {timed(lambda: NonSequentialConstructor(tree))}")
+        print(f"  to_python:           {timed(tree.to_python)}")
+        print(f"  to_python again:     {timed(tree.to_python)}")
+        print(f"  recursive to_python: {timed(lambda: recursive_to_python(tree))}")
+        print(f"  flatten:             {timed(tree.flatten)}")
+        *_, leaf = elements.walk(tree)
+        leaf._parent[0 if isinstance(leaf._parent, elements.Args) and leaf._parent._value[0] else "level_0"] = -1
+        print(f"  flatten, modified:   {timed(tree.flatten)}")
+        print(f"  dump:                {timed(lambda: nip.dump_string(tree))}")
+
+
+if __name__ == "__main__":
+    main()
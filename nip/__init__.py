@@ -1,17 +1,25 @@
+__version__ = "0.11.0"
+
+from .cache import ParseCache, DiskCache, parse_cache
 from .constructor import Constructor
 from .constructor import nip, wrap_module
 from .convertor import pin
 from .main import (
     parse,
     parse_string,
+    parse_many,
     construct,
+    construct_async,
     load,
     load_string,
+    load_many,
     dump,
     dump_string,
     convert,
     run,
 )
-from .elements import Node
+from .elements import Node, unflatten
 from .non_seq_constructor import NonSequentialConstructor
 from .parser import Parser
+from .plan import compile, ConstructionPlan
+from .watcher import watch, Watcher
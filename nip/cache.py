@@ -0,0 +1,231 @@
+# In-process cache of parsed config trees
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from typing import Union, Optional
+
+import nip
+from .elements import Node
+from .parser import Parser
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class _Entry:
+    def __init__(self, mtime_ns: int, size: int, digest: Optional[str], dependencies: list, pickled: bytes):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.dependencies = dependencies  # states of the files inserted with `!!insert`
+        # tree, iterators, links and dependencies. Unpickling is faster than deepcopy and gives a copy
+        self.pickled = pickled
+
+
+class ParseCache:
+    """LRU cache of parsed Documents.
+
+    File is considered unchanged while its mtime and size are the same, and so are the files inserted with `!!insert`.
+    With `check_hash=True` the content hash is also compared, which catches edits that keep mtime and size.
+    Every call returns an independent copy of the tree, so it can be modified freely.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of stored trees. Least recently used are dropped first.
+    check_hash: bool
+        Whether to compare content hash of the file on every access.
+    """
+
+    def __init__(self, maxsize: int = 128, check_hash: bool = False):
+        self.maxsize = maxsize
+        self.check_hash = check_hash
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, parser: Parser, path: Union[str, Path]) -> Node:
+        """Same as `parser.parse(path)` but the tree is taken from the cache if the file was not changed.
+
+        Iterators, links and dependencies of the returned tree are set to the parser as if it was parsed.
+        """
+        path = Path(path)
+        stat = path.stat()
+        key = self._key(parser, path)
+        digest = None
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            if self.check_hash:
+                digest = self._hash(path)
+            dependencies_unchanged = all(_is_unchanged(*file, self.check_hash) for file in entry.dependencies)
+            if digest == entry.digest and dependencies_unchanged:
+                with self._lock:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                tree, parser.iterators, parser.links, parser.dependencies = pickle.loads(entry.pickled)
+                return tree
+
+        tree = parser.parse(path)
+        if self.check_hash and digest is None:
+            digest = self._hash(path)
+        dependencies = [_file_state(dependency, with_hash=self.check_hash) for dependency in parser.dependencies]
+        stored = tree, parser.iterators, parser.links, parser.dependencies
+        pickled = pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = _Entry(stat.st_mtime_ns, stat.st_size, digest, dependencies, pickled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return tree
+
+    def invalidate(self, path: Union[str, Path, None] = None):
+        """Drops cached trees of the file or the whole cache if `path` is not specified."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            resolved = str(Path(path).resolve())
+            for key in [key for key in self._entries if key[0] == resolved]:
+                del self._entries[key]
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    @staticmethod
+    def _key(parser: Parser, path: Path):
+        options = (
+            parser.implicit_fstrings,
+            parser.strict,
+            parser.sequential_links,
+            parser.lazy,
+            parser.weak_parents,
+            parser.share_nodes,
+        )
+        return (str(path.resolve()),) + options
+
+    @staticmethod
+    def _hash(path: Path) -> str:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+parse_cache = ParseCache()  # used by `nip.parse(path, cache=True)`
+
+NIPC_SUFFIX = ".nipc"
+NIPC_FORMAT = 3  # bump when the layout of stored trees changes
+
+
+class DiskCache:
+    """Stores parsed Documents in `.nipc` files to skip parsing on the next process start.
+
+    Compiled file is used while nip version, parser options, the source file
+    and every file inserted with `!!insert` are the same. Files are compared by mtime and size,
+    and by content hash if those have changed.
+
+    Parameters
+    ----------
+    cache_dir: str or Path, optional
+        Directory for the compiled files. By default, they are saved to `__nipcache__`
+        directory next to the source, like python does with `__pycache__`.
+
+    Notes
+    -----
+    Compiled files are pickles. Same as with `__pycache__`, do not use cache directories writable by others.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    def compiled_path(self, path: Union[str, Path]) -> Path:
+        path = Path(path).resolve()
+        if self.cache_dir is None:
+            return path.parent / "__nipcache__" / (path.name + NIPC_SUFFIX)
+        path_hash = hashlib.sha256(str(path).encode()).hexdigest()[:16]
+        return self.cache_dir / f"{path.name}.{path_hash}{NIPC_SUFFIX}"
+
+    def parse(self, parser: Parser, path: Union[str, Path]) -> Node:
+        """Same as `parser.parse(path)` but the tree is loaded from the compiled file if it is up-to-date."""
+        path = Path(path)
+        compiled_path = self.compiled_path(path)
+        header = self._header(parser, path)
+        stored = self._load(compiled_path, header)
+        if stored is not None:
+            self.hits += 1
+            tree, parser.iterators, parser.links, parser.dependencies = stored
+            tree._path = path
+            return tree
+
+        self.misses += 1
+        stat = path.stat()
+        tree = parser.parse(path)
+        files = [_file_state(path, stat)] + [_file_state(dependency) for dependency in parser.dependencies]
+        self._save(compiled_path, header, files, (tree, parser.iterators, parser.links, parser.dependencies))
+        return tree
+
+    @staticmethod
+    def _header(parser: Parser, path: Path) -> tuple:
+        options = (
+            parser.implicit_fstrings,
+            parser.strict,
+            parser.sequential_links,
+            parser.lazy,
+            parser.weak_parents,
+            parser.share_nodes,
+        )
+        return NIPC_FORMAT, nip.__version__, str(path.resolve()), options
+
+    @staticmethod
+    def _load(compiled_path: Path, header: tuple):
+        try:
+            with compiled_path.open("rb") as f:
+                if pickle.load(f) != header:
+                    return None
+                files = pickle.load(f)
+                if not all(_is_unchanged(*file) for file in files):
+                    return None
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+            return None  # missing or broken compiled file is the same as outdated one
+
+    @staticmethod
+    def _save(compiled_path: Path, header: tuple, files: list, stored: tuple):
+        try:
+            compiled_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=compiled_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for item in (header, files, stored):
+                        pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, compiled_path)  # readers never see a partially written file
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass  # same as python: not writable cache is not an error
+
+
+def _file_state(path: Path, stat: os.stat_result = None, with_hash: bool = True) -> tuple:
+    """Path, mtime, size and content hash of the file. Without `with_hash` the hash is None and is not compared."""
+    stat = stat or path.stat()
+    digest = hashlib.sha256(path.read_bytes()).hexdigest() if with_hash else None
+    return str(path.resolve()), stat.st_mtime_ns, stat.st_size, digest
+
+
+def _is_unchanged(path: str, mtime_ns: int, size: int, digest: Optional[str], check_hash: bool = False) -> bool:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if stat.st_mtime_ns == mtime_ns and stat.st_size == size and not check_hash:
+        return True
+    if digest is None or stat.st_size != size:  # without the hash only mtime and size can be compared
+        return False
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest() == digest
@@ -1,23 +1,81 @@
 # Constructor of tagged objects
 import importlib
 import importlib.util
-from types import FunctionType, ModuleType, BuiltinFunctionType
-from typing import Callable, Optional, Union
+from types import FunctionType, ModuleType, BuiltinFunctionType, MappingProxyType
+from typing import Callable, Optional, Union, Mapping
 
 from .utils import get_sub_dict
 
-global_builders = {}  # builders shared between Constructors
+
+class BuilderRegistry(dict):
+    """Builders by their tags. Every modification increases `version`."""
+
+    version = 0
+
+    def changed(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.changed()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args):
+        self.changed()
+        return super().pop(*args)
+
+    def popitem(self):
+        self.changed()
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self.changed()
+
+
+global_builders = BuilderRegistry()  # builders shared between Constructors
 global_calls = {}  # history of object creations
+_snapshot = (-1, MappingProxyType({}))  # version of `global_builders` and read-only builders of this version
+
+
+def builders_snapshot() -> Mapping[str, Callable]:
+    """Read-only builders of `global_builders` and `NIPBuilder` subclasses. Rebuilt only after they are changed."""
+    global _snapshot
+    version, builders = _snapshot
+    if version != global_builders.version:
+        version = global_builders.version  # changes during the copy are taken by the next call
+        builders = dict(global_builders)
+        builders.update(get_sub_dict(NIPBuilder))
+        builders = MappingProxyType(builders)
+        _snapshot = version, builders
+    return builders
 
 
 class Constructor:
-    def __init__(self, ignore_rewriting=False, load_builders=True, strict_typing=False):
+    def __init__(self, ignore_rewriting=False, load_builders=True, strict_typing=False, typing_depth="full"):
         self.builders = {}
         self.ignore_rewriting = ignore_rewriting
         if load_builders:
             self.load_builders()
         self.vars = {}
         self.strict_typing = strict_typing
+        self.typing_depth = typing_depth  # one of `nip.utils.TYPING_DEPTHS`
 
     def construct(self, element):
         return element._construct(self)
@@ -35,11 +93,15 @@ class Constructor:
         if tag is None:
             tag = func.__name__
         assert self.ignore_rewriting or tag not in self.builders, f"Builder for tag '{tag}' already registered"
+        if isinstance(self.builders, MappingProxyType):  # shared snapshot is copied on the first registration
+            self.builders = dict(self.builders)
         self.builders[tag] = func
 
     def load_builders(self):
-        self.builders.update(global_builders)
-        self.builders.update(get_sub_dict(NIPBuilder))
+        if self.builders:
+            self.builders = {**self.builders, **builders_snapshot()}
+        else:
+            self.builders = builders_snapshot()
 
 
 class ConstructorError(Exception):
@@ -61,7 +123,9 @@ class ConstructorError(Exception):
 # mb: add meta for auto detecting this class as NIP-builder
 # ToDo: Add init wrapper for auto detection init args for convenient object dumping
 class NIPBuilder:
-    pass
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        global_builders.changed()
 
 
 def nip_decorator(name=None, convertable=False):
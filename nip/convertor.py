@@ -1,9 +1,10 @@
 from typing import Optional, Callable, Union
 
 from nip.constructor import global_builders, ArgsKwargs
-from nip.elements import Node, Args, Tag, Value
+from nip.elements import Node, Args, Tag, Value, Nothing
 
 global_convertors = {}
+_SCALARS = (int, float, str, bool)
 
 
 class Convertor:
@@ -13,7 +14,14 @@ class Convertor:
             self._load_globals()
 
     def convert(self, obj: object) -> Node:
+        if isinstance(obj, Node):
+            return obj
+        if obj is None:
+            return Nothing()
+
         class_name = type(obj).__name__
+        if obj.__class__ in _SCALARS and class_name not in self.convertors:  # the most common case
+            return Value("value", obj)
         if class_name in self.convertors:
             tag, convertor = self.convertors[class_name]
             return Tag(tag, self.convert(convertor(obj)))
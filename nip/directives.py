@@ -1,29 +1,28 @@
 """Contains nip directives."""
 
+import os
+import pickle
+from pathlib import Path
+
 import nip.elements
 from .constructor import Constructor
 from .parser import Parser, ParserError
-from .stream import Stream
+from .stream import Stream, StreamError
 
 
-def insert_directive(right_value, stream: Stream):
+def insert_directive(right_value, stream: Stream, parser: Parser):
     if isinstance(right_value, nip.elements.Value):
         constructor = Constructor()
         path = constructor.construct(right_value)
         assert isinstance(path, str), "Load directive expects path as an argument."
-        parser = Parser()
-        config = parser.parse(path)  # Document
-        return config._value
+        return _parse_inserted(path, {}, stream, parser)
 
     elif isinstance(right_value, nip.elements.Args):
         assert len(right_value._value[0]) == 1, "only single positional argument will be treated as config path."
         constructor = Constructor()
         path = constructor.construct(right_value._value[0][0])
         assert isinstance(path, str), "Load directive expects path as first argument."
-        parser = Parser()
-        parser.link_replacements = right_value._value[1]
-        config = parser.parse(path)  # Document
-        return config._value
+        return _parse_inserted(path, right_value._value[1], stream, parser)
 
     else:
         raise ParserError(
@@ -32,10 +31,88 @@ def insert_directive(right_value, stream: Stream):
         )
 
 
+def _parse_inserted(path: str, link_replacements: dict, stream: Stream, parser: Parser):
+    """Parses inserted file once per top level parse. Next insertions of it are copies.
+
+    Parsed files are kept in `parser.insert_cache` while they and the files they insert are not modified,
+    so parsers reused after the files are edited and `parse_many` pools parse them again.
+    """
+    resolved = Path(path).resolve()
+    chain = parser.insert_chain + [parser.path]
+    if resolved in chain:
+        cycle = " -> ".join(str(p) for p in chain[chain.index(resolved) :] + [resolved])
+        raise ParserError(stream, f"Recursive !!insert: {cycle}")
+    includes = parser.include_graph.setdefault(parser.path, [])
+    if resolved not in includes:
+        includes.append(resolved)
+
+    cached = parser.insert_cache.get(resolved)
+    if cached is None or _file_states(cached[1]) != cached[2]:
+        inserted_parser = _inserted_parser(parser, chain)
+        try:
+            config = inserted_parser.parse(path)  # Document
+        except (ParserError, StreamError):
+            if not link_replacements:
+                raise
+            # replaced links may be required to parse the file (e.g. list for `@` operator)
+            inserted_parser = _inserted_parser(parser, chain)
+            inserted_parser.link_replacements = link_replacements
+            config = inserted_parser.parse(path)
+            _add_dependencies(parser, [resolved] + inserted_parser.dependencies)
+            return config._value
+        inserted = config._value
+        inserted._parent = None  # the Document of the inserted file is not stored with it
+        pickled = pickle.dumps(inserted, protocol=pickle.HIGHEST_PROTOCOL)
+        dependencies = [resolved] + inserted_parser.dependencies
+        cached = parser.insert_cache[resolved] = pickled, dependencies, _file_states(dependencies)
+
+    pickled, dependencies, _ = cached
+    _add_dependencies(parser, dependencies)
+    return _replace_links(pickle.loads(pickled), link_replacements)
+
+
+def _inserted_parser(parser: Parser, chain: list) -> Parser:
+    inserted_parser = Parser()
+    inserted_parser.include_graph = parser.include_graph
+    inserted_parser.insert_cache = parser.insert_cache
+    inserted_parser.insert_chain = chain
+    return inserted_parser
+
+
+def _file_states(paths: list) -> list:
+    states = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            states.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            states.append(None)
+    return states
+
+
+def _add_dependencies(parser: Parser, dependencies: list):
+    for dependency in dependencies:
+        if dependency not in parser.dependencies:
+            parser.dependencies.append(dependency)
+
+
+def _replace_links(node: "nip.elements.Node", link_replacements: dict) -> "nip.elements.Node":
+    if isinstance(node, nip.elements.Link) and node._name in link_replacements:
+        return link_replacements[node._name]
+    if isinstance(node, nip.elements.Args):
+        args, kwargs = node._value
+        args[:] = [_replace_links(item, link_replacements) for item in args]
+        for key, value in kwargs.items():
+            kwargs[key] = _replace_links(value, link_replacements)
+    elif isinstance(node._value, nip.elements.Node):
+        node._value = _replace_links(node._value, link_replacements)
+    return node
+
+
 _directives = {"insert": insert_directive}
 
 
-def call_directive(name, right_value, stream: Stream):
+def call_directive(name, right_value, stream: Stream, parser: Parser):
     if name not in _directives:
         raise ParserError(stream, f"Unknown parser directive '{name}'.")
-    return _directives[name](right_value, stream)
+    return _directives[name](right_value, stream, parser)
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import copy
+import hashlib
 import logging
+import sys
+import weakref
 from abc import abstractmethod, ABC
 from pathlib import Path
-from typing import Any, Union, Tuple, Dict
+from typing import Any, Union, Tuple, Dict, List, Iterator, Iterable, Callable
 
 import nip.constructor  # This import pattern because of cycle imports
 import nip.directives
@@ -20,12 +24,36 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class Node(ABC, object):
-    """Base token for nip file"""
+    """Base token for nip file
+
+    Nodes have no `__dict__`. Parsers with `weak_parents=True` make nodes refer to their parents weakly,
+    so a dropped tree is freed right away without the cyclic garbage collector.
+    Values computed from the subtree are cached in the `_CACHE_SLOTS` and cleared by `_invalidate`.
+    Only nodes that own their whole subtree keep them: a change of a node shared with a fork clears one parent chain.
+    """
+
+    __slots__ = ("_name", "_value", "_parent_ref", "_fingerprint", "_python", "__weakref__")
+    _leaf = False  # value of the node is not a Node
+    _CACHE_SLOTS = ("_fingerprint", "_python")  # not copied and not pickled
 
     def __init__(self, name: str = "", value: Union[Node, Any] = None):
-        self._name = name
-        self._value = value
-        self._parent = None
+        set_slot = object.__setattr__  # skips `__setattr__`, nodes are created by thousands
+        set_slot(self, "_name", name)
+        set_slot(self, "_value", value)
+        set_slot(self, "_parent_ref", None)
+        set_slot(self, "_fingerprint", None)
+        set_slot(self, "_python", None)
+
+    @property
+    def _parent(self) -> Union[Node, None]:
+        parent_ref = self._parent_ref  # parent node or a weak reference to it
+        if parent_ref.__class__ is weakref.ref:
+            return parent_ref()
+        return parent_ref
+
+    @_parent.setter
+    def _parent(self, parent: Union[Node, None]):
+        self._parent_ref = parent
 
     @classmethod
     @abstractmethod
@@ -40,23 +68,67 @@ class Node(ABC, object):
             raise KeyError(f"Unexpected item type: {type(item)}")
         if isinstance(item, str) and len(item) == 0:
             return self
-        return self._value[item]
+        return self._own_value()[item]
 
     def __getattr__(self, item):  # unable to access names like `construct` and 'dump` via this method
+        if item.startswith("__"):  # protocols like copy and pickle look for optional dunder methods
+            raise AttributeError(item)
         return self.__getitem__(item)
 
+    def __getstate__(self):  # explicit state methods keep copy and pickle away from `__getattr__`
+        state = {"_parent": self._parent}  # weak reference can't be pickled
+        if self._parent_ref.__class__ is weakref.ref:
+            state["_weak_parent"] = True
+        for name, slot in _slots(self.__class__).items():
+            if name != "_parent_ref" and name not in Node._CACHE_SLOTS:
+                try:
+                    state[name] = slot.__get__(self)
+                except AttributeError:  # not set
+                    pass
+        return state
+
+    def __setstate__(self, state):
+        slots = _slots(self.__class__)
+        for name in Node._CACHE_SLOTS:
+            slots[name].__set__(self, None)
+        for name, value in state.items():
+            if name == "_parent":
+                self._parent = value
+            elif name in slots:
+                slots[name].__set__(self, value)
+        if state.get("_weak_parent") and self._parent_ref is not None:
+            self._parent_ref = weakref.ref(self._parent_ref)
+
+    def __deepcopy__(self, memo):
+        node = self.__class__.__new__(self.__class__)
+        memo[id(self)] = node
+        node.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        return node
+
     def __setitem__(self, key, value):
-        self._value[key] = value
+        self._own_value()[key] = value
         self._value._parent = self
+        self._invalidate()
 
     def __setattr__(self, key, value):
         if key.startswith("_"):  # mb: ensure not user's node name?
-            self.__dict__[key] = value
+            object.__setattr__(self, key, value)
         else:
             self.__setitem__(key, value)
 
     def to_python(self):
-        return self._value.to_python()
+        return fold(self._python_view(), _python_copy_children, _python_copy)
+
+    def _python_view(self):
+        """Python value of the node. Values of the subtrees are cached until they are modified, so don't change it."""
+        return fold(self, _python_children, _python_value)
+
+    def _python_children(self) -> List[Node]:
+        """Nodes which python values are needed to get the value of this one"""
+        return () if self._leaf else [self._value]
+
+    def _python_value(self, values: list):
+        return values[0]
 
     def _construct(self, constructor: nip.constructor.Constructor):
         return self._value._construct(constructor)
@@ -65,7 +137,11 @@ class Node(ABC, object):
         return nip.construct(self, base_config=base_config, strict_typing=strict_typing, nonsequential=nonsequential)
 
     def _dump(self, dumper: nip.dumper.Dumper):
-        return self._value._dump(dumper)
+        return _write_dump(self, dumper)
+
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        """Strings and (node, dumper) pairs that make up the dumped node, in order"""
+        return [(self._value, dumper)]
 
     def dump(self, path: Union[str, Path]):
         nip.dump(path, self)
@@ -74,29 +150,216 @@ class Node(ABC, object):
         return nip.dump_string(self)
 
     def __eq__(self, other):
-        return self._name == other._name and self._value == other._value
+        if self is other:
+            return True
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self.fingerprint() == other.fingerprint()
+
+    def fingerprint(self) -> str:
+        """Hash of names, values, tags and links of the subtree.
+
+        Equal trees have equal fingerprints: kwargs order and numeric types of equal numbers don't change it.
+        The hashes of the subtrees are cached until they are modified.
+        """
+        return fold(self, _fingerprint_children, _fingerprint_digest)
+
+    def _hashed_children(self) -> List[Node]:
+        """Nodes which fingerprints are hashed into the fingerprint of this one"""
+        return [child for _, child in self._children()]
+
+    def _hashed_header(self) -> tuple:
+        """Own data of the node hashed into its fingerprint"""
+        return self.__class__.__name__, self._name, _canonical(self._value) if self._leaf else None
+
+    def fork(self) -> Node:
+        """Copy-on-write copy of the subtree.
+
+        The fork and the original share all the nodes until they are accessed with `[]` or iterated over:
+        then the path to the accessed node is copied for the tree it is accessed from.
+        So modifying either tree doesn't change the other one and costs only the copies of the modified paths.
+        Nodes taken from the original before forking and nodes yielded by `walk` are still shared.
+        """
+        snapshot = self._clone()  # keeps the shared children, so neither tree owns them
+        for _, child in snapshot._children():
+            child._parent = snapshot
+        self._invalidate()  # the cached values don't follow changes of the shared nodes anymore
+        fork = self._clone()
+        fork._parent = None
+        return fork
+
+    def _clone(self) -> Node:
+        """Shallow copy of the node that shares its children, so it has no cached values"""
+        node = self.__class__.__new__(self.__class__)
+        node.__setstate__(self.__getstate__())
+        return node
+
+    def _adopt(self, child: Node) -> Node:
+        """Child node that belongs to this node only: a copy of the child if it belongs to another one"""
+        if child._parent is not None:
+            child = child._clone()
+        child._parent = self
+        return child
+
+    def _owns(self, child: Node) -> bool:
+        """Whether changes of the child clear the cached values of this node"""
+        return child._parent is self
+
+    def _own_value(self):
+        value = self._value
+        if isinstance(value, Node) and value._parent is not self:
+            value = self._value = self._adopt(value)
+        return value
+
+    def _invalidate(self):
+        """Clears the cached values of the node and its parents after modification"""
+        node = self
+        while True:
+            for slot in Node._CACHE_SLOTS:
+                object.__setattr__(node, slot, None)
+            node = node._parent
+            if node is None:
+                break
 
     def flatten(self, delimiter=".") -> Dict:
-        return nip.utils.flatten(self.to_python(), delimiter)
+        return dict(self.iter_flat(delimiter))
+
+    def iter_flat(self, delimiter: str = ".") -> Iterator[Tuple[str, Any]]:
+        """Yields (path, value) pairs of `flatten()` without building the python value of the node first.
+
+        Paths are built once per node: the path of a child is the path of its parent plus one key.
+        """
+        stack = [iter([(None, self)])]  # path is None for the node itself
+        while stack:
+            for path, item in stack[-1]:
+                if item.__class__ is Value:
+                    item = item._value
+                elif isinstance(item, Node):
+                    if item.__class__ is Lazy:
+                        item._load()
+                    if item._python is not None:
+                        item = item._python
+                    elif isinstance(item, Args):
+                        items = list(enumerate(item._value[0])) + list(item._value[1].items())
+                        stack.append(
+                            iter(
+                                [
+                                    (str(key) if path is None else f"{path}{delimiter}{key}", child)
+                                    for key, child in items
+                                ]
+                            )
+                        )
+                        break
+                    else:
+                        children = item._python_children()
+                        stack.append(iter([(path, children[0] if children else item._python_value(children))]))
+                        break
+                if isinstance(item, (dict, list, tuple)):
+                    items = item.items() if isinstance(item, dict) else enumerate(item)
+                    stack.append(
+                        iter([(str(key) if path is None else f"{path}{delimiter}{key}", value) for key, value in items])
+                    )
+                    break
+                yield "" if path is None else path, item
+            else:
+                stack.pop()
+
+    def apply_overrides(
+        self,
+        overrides: Union[Dict[str, Any], Iterable[Union[str, Tuple[str, Any]]]],
+        create_missing: bool = False,
+        delimiter: str = ".",
+    ) -> Node:
+        """Sets several values into the node at once.
+
+        Overrides are grouped by path prefix, so every node on the paths is accessed once.
+        Either all of them are applied or none: invalid values, conflicting and missing paths are reported together.
+
+        Parameters
+        ----------
+        overrides:
+            Mapping of paths to values, (path, value) pairs or "path=value" strings.
+            String values are parsed as nip values in one go, other values are converted with `nip.convert`.
+        create_missing:
+            Whether to add missing keys and positional items right after the last one instead of raising.
+        delimiter:
+            Delimiter of path keys.
+
+        Returns
+        -------
+        node:
+            The node itself.
+
+        Raises
+        ------
+        OverrideError:
+            If some override can not be applied. Lists of messages are in its `missing`, `conflicts` and `invalid`.
+        """
+        pairs, invalid = _override_pairs(overrides)
+        conflicts, missing = [], []
+        trie = _FlatTrie(pairs, delimiter, lambda node: node, conflicts)
+        assignments = trie.plan(self, create_missing, missing)
+        if invalid or conflicts or missing:
+            raise OverrideError(missing, conflicts, invalid)
+        _assign(assignments)
+        return self
 
-    def _update_parents(self):
-        if isinstance(self._value, Node):
-            self._value._parent = self
-            self._value._update_parents()
+    def _children(self) -> List[Tuple[Union[str, int, None], Node]]:
+        """Child nodes with their keys. Key is None for a child that doesn't extend the path."""
+        return () if self._leaf else [(None, self._value)]
+
+    def _update_parents(self, weak: bool = False):
+        set_parent_ref = Node._parent_ref.__set__  # skips `__setattr__`, children share the weak reference
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            parent_ref = weakref.ref(node) if weak else node
+            for _, child in node._children():
+                set_parent_ref(child, parent_ref)
+                if not child._leaf:
+                    stack.append(child)
 
     def _get_root(self):
-        if self._parent is None:
-            return self
-        return self._parent._get_root()
+        node = self
+        while node._parent_ref is not None:
+            parent = node._parent
+            if parent is None:
+                raise ReferenceError(
+                    "Parent of the node was freed. Keep the parsed Document while using its parts "
+                    "or parse it without `weak_parents`."
+                )
+            node = parent
+        return node
 
     def update(self):
-        self._get_root().update()
+        root = self._get_root()
+        if root is self:
+            raise nip.dumper.DumpError("Unable to update the config file: node is not a part of a parsed Document")
+        root.update()
 
 
 Element = Node  # backward compatibility until 1.* version
 
 
+def _slots(cls) -> Dict[str, Any]:
+    """Slot descriptors of the node class by their names"""
+    slots = _SLOTS.get(cls)
+    if slots is None:
+        slots = {}
+        for klass in cls.__mro__:
+            for name in klass.__dict__.get("__slots__", ()):
+                if name != "__weakref__":
+                    slots[name] = klass.__dict__[name]
+        _SLOTS[cls] = slots
+    return slots
+
+
+_SLOTS = {}
+
+
 class Document(Node):  # ToDo: add multi document support
+    __slots__ = ("_path",)
+
     def __init__(self, name: str = "", value: Union[Node, Any] = None):
         super().__init__(name, value)
         self._path = None
@@ -104,7 +367,11 @@ class Document(Node):  # ToDo: add multi document support
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Document:
         doc_name = cls._read_name(stream)
-        content = read_node(stream, parser)
+        content = None
+        if parser.lazy:
+            content = Lazy.read(stream, parser)
+        if content is None:
+            content = read_node(stream, parser)
         return Document(doc_name, content)
 
     @classmethod
@@ -116,17 +383,20 @@ class Document(Node):  # ToDo: add multi document support
                 return read_tokens[1]._value
         return ""
 
-    def _dump(self, dumper: nip.dumper.Dumper):
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
         string = "---"
         if self._name:
             string += " " + self._name + " "
-        return string + self._value._dump(dumper)
+        return [string, (self._value, dumper)]
 
     def update(self):
         self.dump(self._path)
 
 
 class Value(Node):
+    __slots__ = ()
+    _leaf = True
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[None, Value]:
         tokens_list = [
@@ -145,22 +415,33 @@ class Value(Node):
 
         return None
 
-    def to_python(self):
+    def _python_value(self, values: list):
         return self._value
 
+    def _hashed_header(self) -> tuple:
+        return self.__class__.__name__, _canonical(self._value)  # name is the type of the read token
+
+    def _clone(self) -> Value:
+        node = super()._clone()
+        if isinstance(self._value, (list, dict)):
+            node._value = copy.copy(self._value)
+        return node
+
     def _construct(self, constructor: nip.constructor.Constructor = None):
         return self._value
 
-    def _dump(self, dumper: nip.dumper.Dumper):
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
         if isinstance(self._value, str):
-            return f'"{self._value}"'
-        return str(self._value)
+            return [f'"{self._value}"']
+        return [str(self._value)]
 
     def __len__(self):
         return len(self._value)
 
 
 class LinkCreation(Node):
+    __slots__ = ()
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[Node, None]:
         read_tokens = stream.peek(tokens.Operator("&"), tokens.Name)
@@ -185,11 +466,14 @@ class LinkCreation(Node):
             constructor.vars[self._name] = self._value._construct(constructor)
         return constructor.vars[self._name]
 
-    def _dump(self, dumper: nip.dumper.Dumper):
-        return f"&{self._name} {self._value._dump(dumper)}"
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        return [f"&{self._name} ", (self._value, dumper)]
 
 
 class Link(Node):
+    __slots__ = ()
+    _leaf = True
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[Node, None]:
         read_tokens = stream.peek(tokens.Operator("*"), tokens.Name)
@@ -207,17 +491,19 @@ class Link(Node):
 
         return Link(name)
 
-    def to_python(self):
+    def _python_value(self, values: list):
         return "nil"  # something that means that object is not constructed yet.
 
     def _construct(self, constructor: nip.constructor.Constructor):
         return constructor.vars[self._name]
 
-    def _dump(self, dumper: nip.dumper.Dumper):
-        return f"*{self._name}"
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        return [f"*{self._name}"]
 
 
 class Tag(Node):
+    __slots__ = ()
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[Tag, None]:
         read_tokens = stream.peek(tokens.Operator("!"), tokens.Name)
@@ -248,7 +534,7 @@ class Tag(Node):
                 f"Constructor for Tag '{self._name}' is not registered.",
             )
 
-        messages = nip.utils.check_typing(constructor.builders[self._name], args, kwargs)
+        messages = nip.utils.check_typing(constructor.builders[self._name], args, kwargs, constructor.typing_depth)
         if len(messages) > 0:
             if constructor.strict_typing:
                 raise nip.constructor.ConstructorError(self, args, kwargs, "\n".join(messages))
@@ -260,11 +546,13 @@ class Tag(Node):
         except Exception as e:
             raise nip.constructor.ConstructorError(self, args, kwargs, e)
 
-    def _dump(self, dumper: nip.dumper.Dumper):
-        return f"!{self._name} " + self._value._dump(dumper)
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        return [f"!{self._name} ", (self._value, dumper)]
 
 
 class Class(Node):
+    __slots__ = ()
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[Class, None]:
         read_tokens = stream.peek(tokens.Operator("!&"), tokens.Name)
@@ -285,11 +573,13 @@ class Class(Node):
 
         return constructor.builders[self._name]
 
-    def _dump(self, dumper: nip.dumper.Dumper):
-        return f"!&{self._name} " + self._value._dump(dumper)
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        return [f"!&{self._name} ", (self._value, dumper)]
 
 
 class Args(Node):
+    __slots__ = ()
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[Args, None]:
         start_indent = stream.pos
@@ -370,28 +660,49 @@ class Args(Node):
         return bool(self._value[0]) or bool(self._value[1])
 
     def __getitem__(self, item):
+        """Resolves `key`, dotted path `key.inner_key.0` or index of positional argument.
+
+        Path segments are looked up in kwargs directly. Keys may contain dots as well,
+        so if the shortest matching prefix doesn't lead to the item, longer ones are tried.
+        """
         if not isinstance(item, (str, int)):
             raise KeyError(f"Unexpected item type: {type(item)}")
-        if isinstance(item, str) and len(item) == 0:
-            return self
         if isinstance(item, int):
-            return self._value[0][item]
-        key = None
-        for key in self._value[1]:
-            if item.startswith(key):
-                break
-        if not item.startswith(key):
+            return self._own_item(self._value[0], item)
+        if len(item) == 0:
+            return self
+        kwargs = self._value[1]
+        if item in kwargs:
+            return self._own_item(kwargs, item)
+        if item.isdecimal():  # names always start with a letter
+            if int(item) < len(self._value[0]):
+                return self._own_item(self._value[0], int(item))
             raise KeyError(f"'{item}' is not a part of the Node.")
-        if len(item) == len(key):
-            return self._value[1][key]
-        if item[len(key)] != ".":
-            raise KeyError(f"items should be separated by a dot '.'.")
 
-        item = item[len(key) + 1 :]
-        return self._value[1][key][item]
+        start = 0
+        while True:
+            dot = item.find(".", start)
+            if dot < 0:
+                raise KeyError(f"'{item}' is not a part of the Node.")
+            key = item[:dot]
+            if key in kwargs or key.isdecimal():
+                try:
+                    return self[key][item[dot + 1 :]]
+                except (KeyError, IndexError, TypeError):  # TypeError: value can't be subscripted
+                    pass
+            start = dot + 1
 
     def __setitem__(self, key, value):
-        value = nip.convert(value)
+        if isinstance(key, str) and key not in self._value[1] and "." in key:
+            path, _, last_key = key.rpartition(".")
+            try:
+                parent = self[path]
+            except KeyError:
+                parent = None
+            if parent is not None and (isinstance(parent._value, Args) or isinstance(parent, Args)):  # may be Lazy
+                parent[int(last_key) if last_key.isdecimal() else last_key] = value
+                return
+        value = self._adopt(nip.convert(value))
         if isinstance(key, int):
             if not -1 <= key < len(self._value[0]):
                 raise KeyError(
@@ -403,22 +714,39 @@ class Args(Node):
             self._value[0][key] = value
         else:
             self._value[1][key] = value
+        self._invalidate()
+
+    def _own_item(self, items: Union[list, dict], key: Union[int, str]) -> Node:
+        child = items[key]
+        if child._parent is not self:
+            child = items[key] = self._adopt(child)
+        return child
 
     def append(self, value):
-        self._value[0].append(nip.convert(value))
+        value = self._adopt(nip.convert(value))
+        self._value[0].append(value)
+        self._invalidate()
 
     def __len__(self):
         return len(self._value[0]) + len(self._value[1])
 
     def __iter__(self):
-        for item in self._value[0]:
-            yield item
-        for key, item in self._value[1].items():
-            yield item
-
-    def to_python(self):
-        args = list(item.to_python() for item in self._value[0])
-        kwargs = {key: value.to_python() for key, value in self._value[1].items()}
+        """Items as with `[]`: nodes shared with a fork are copied for this node"""
+        args, kwargs = self._value
+        index = 0
+        while index < len(args):
+            yield self._own_item(args, index)
+            index += 1
+        for key in list(kwargs):
+            yield self._own_item(kwargs, key)
+
+    def _python_children(self) -> List[Node]:
+        return self._value[0] + list(self._value[1].values())
+
+    def _python_value(self, values: list):
+        n_args = len(self._value[0])
+        args = values[:n_args]
+        kwargs = dict(zip(self._value[1], values[n_args:]))
         assert args or kwargs, "Error converting Args node to python"  # This should never happen
         if args and kwargs:
             result = {}
@@ -435,30 +763,35 @@ class Args(Node):
             return args, kwargs
         return args or kwargs
 
-    def _dump(self, dumper: nip.dumper.Dumper):
-        dumped_args = "\n".join(
-            [" " * dumper.indent + f"- {item._dump(dumper + dumper.default_shift)}" for item in self._value[0]]
-        )
-        string = ("\n" if dumped_args else "") + dumped_args
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        item_dumper = dumper + dumper.default_shift
+        indent = "\n" + " " * dumper.indent
+        parts = []
+        for item in self._value[0]:
+            parts += [indent + "- ", (item, item_dumper)]
+        for key, value in self._value[1].items():
+            parts += [indent + f"{key}: ", (value, item_dumper)]
+        return parts
+
+    def _children(self) -> List[Tuple[Union[str, int, None], Node]]:
+        return list(enumerate(self._value[0])) + list(self._value[1].items())
 
-        dumped_kwargs = "\n".join(
-            [
-                " " * dumper.indent + f"{key}: {value._dump(dumper + dumper.default_shift)}"
-                for key, value in self._value[1].items()
-            ]
-        )
-        string += ("\n" if dumped_kwargs else "") + dumped_kwargs
+    def _clone(self) -> Args:
+        node = super()._clone()
+        node._value = (list(self._value[0]), dict(self._value[1]))
+        return node
 
-        return string
+    def _hashed_children(self) -> List[Node]:
+        kwargs = self._value[1]
+        return self._value[0] + [kwargs[key] for key in _sorted_keys(kwargs)]
 
-    def _update_parents(self):
-        self.__dict__.update(self._value[1])
-        for item in self:
-            item._parent = self
-            item._update_parents()
+    def _hashed_header(self) -> tuple:
+        return self.__class__.__name__, self._name, len(self._value[0]), tuple(_sorted_keys(self._value[1]))
 
 
 class Iter(Node):  # mark all parents as Iterable and allow construct specific instance
+    __slots__ = ("_return_index",)
+
     def __init__(self, name: str = "", value: Any = None):
         super(Iter, self).__init__(name, value)
         self._return_index = -1
@@ -485,12 +818,33 @@ class Iter(Node):  # mark all parents as Iterable and allow construct specific i
         parser.iterators.append(iterator)
         return iterator
 
-    def to_python(self):
+    def _children(self) -> List[Tuple[Union[str, int, None], Node]]:
+        return [(None, self._value)] if isinstance(self._value, Args) else ()
+
+    def _hashed_header(self) -> tuple:
+        value = _canonical(self._value) if isinstance(self._value, list) else None
+        return self.__class__.__name__, self._name, self._return_index, value
+
+    def _selected(self) -> Any:
+        """Item of the iterator at the current index"""
+        if isinstance(self._value, Args):
+            return self._value._value[0][self._return_index]  # not `[]`, that copies nodes of forks
+        return self._value[self._return_index]
+
+    def _python_children(self) -> List[Node]:
         if self._return_index == -1:
             raise iter(self._value)
-        if isinstance(self._value[self._return_index], Node):
-            return self._value[self._return_index].to_python()
-        return self._value[self._return_index]
+        item = self._selected()
+        return [item] if isinstance(item, Node) else []
+
+    def _python_value(self, values: list):
+        return values[0] if values else self._selected()
+
+    def _owns(self, child: Node) -> bool:
+        args = self._value
+        if child._parent is self:
+            return True
+        return isinstance(args, Args) and child._parent is args and args._parent is self  # the selected item
 
     def _construct(self, constructor: nip.constructor.Constructor):
         if self._return_index == -1:
@@ -498,22 +852,25 @@ class Iter(Node):  # mark all parents as Iterable and allow construct specific i
         if isinstance(self._value, list):
             return self._value[self._return_index]
         elif isinstance(self._value, Args):
-            return self._value[self._return_index]._construct(constructor)
+            return self._selected()._construct(constructor)
         else:
             raise nip.constructor.ConstructorError(self, (), {}, "Unexpected iter value type")
 
-    def _dump(self, dumper: nip.dumper.Dumper):
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
         if self._return_index == -1:
             raise nip.dumper.DumpError("Dumping an iterator but index was not specified by IterParser")
         if isinstance(self._value, list):
-            return str(self._value[self._return_index])
+            return [str(self._value[self._return_index])]
         elif isinstance(self._value, Args):
-            return self._value[self._return_index]._dump(dumper)
+            return [(self._selected(), dumper)]
         else:
             raise nip.dumper.DumpError("Unable to dump Iterable node: unexpected value type")
 
 
 class InlinePython(Node):
+    __slots__ = ()
+    _leaf = True
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[InlinePython, None]:
         read_tokens = stream.peek(tokens.InlinePython)
@@ -528,34 +885,40 @@ class InlinePython(Node):
         locals().update(constructor.vars)
         return eval(self._value)
 
-    def _dump(self, dumper: nip.dumper.Dumper):
-        return f"`{self._value}`"
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        return [f"`{self._value}`"]
 
-    def to_python(self):
+    def _python_value(self, values: list):
         return f"`{self._value}`"
 
 
 class Nothing(Node):
+    __slots__ = ()
+    _leaf = True
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[Nothing, None]:
         if not stream:
             return Nothing()
 
         indent = stream.pos
-        if stream.pos == 0 or (stream.lines[stream.n][: stream.pos].isspace() and indent <= parser.last_indent):
+        if stream.pos == 0 or (stream.at_line_start() and indent <= parser.last_indent):
             return Nothing()
 
     def _construct(self, constructor: nip.constructor.Constructor):
         return self
 
-    def _dump(self, dumper: nip.dumper.Dumper):
-        return ""
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        return [""]
 
-    def to_python(self):
+    def _python_value(self, values: list):
         return None
 
 
 class FString(Node):  # Includes f-string and r-string
+    __slots__ = ()
+    _leaf = True
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[FString, None]:
         read_tokens = stream.peek(tokens.PythonString)
@@ -574,14 +937,16 @@ class FString(Node):  # Includes f-string and r-string
         locals().update(constructor.vars)
         return eval(f"f{self._value}")
 
-    def _dump(self, dumper: nip.dumper.Dumper):
-        return f"f{self._value}"
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        return [f"f{self._value}"]
 
-    def to_python(self):
+    def _python_value(self, values: list):
         return f"f{self._value}"
 
 
 class Directive(Node):
+    __slots__ = ()
+
     @classmethod
     def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[FString, None]:
         read_tokens = stream.peek(tokens.Operator("!!"), tokens.Name)
@@ -592,23 +957,646 @@ class Directive(Node):
 
         value = read_node(stream, parser)
 
-        return nip.directives.call_directive(name, value, stream)
+        return nip.directives.call_directive(name, value, stream, parser)
+
+
+class Lazy(Node):
+    """Top-level value that is parsed on the first access. Created by `Parser(lazy=True)`.
+
+    Once parsed, the node turns into the read one, so all the references to it stay valid.
+    Until then, its `_value` slot keeps lines of the `key: value` pair, their position and parser options.
+    """
+
+    __slots__ = ()
+
+    _eager_markers = ("&", "@", "!!")  # links, iterators and directives change the parser, so they are read at once
+
+    def __init__(self, source: str, line: int, parser: nip.parser.Parser):
+        self._name = ""
+        self._parent = None
+        self._fingerprint = None
+        self._python = None
+        options = parser.implicit_fstrings, parser.strict, parser.sequential_links
+        Node._value.__set__(self, (source, line, options))
+
+    @classmethod
+    def read(cls, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[Args, None]:
+        """Reads keys of the top-level dict. Returns None if the document is not a top-level dict."""
+        sections = read_sections(stream, parser)
+        if sections is None:
+            return None
+        kwargs = {}
+        for key, line, source in sections:
+            if any(marker in source for marker in cls._eager_markers):
+                kwargs[key] = read_section(source, line, parser)
+            else:
+                kwargs[key] = Lazy(source, line, parser)
+        return Args("args", ([], kwargs))
+
+    def _load(self):
+        source, line, options = Node._value.__get__(self)
+        node = read_section(source, line, nip.parser.Parser(*options))
+        object.__setattr__(self, "__class__", node.__class__)  # all the possible classes have the same slots
+        self._name = node._name
+        self._value = node._value
+        self._update_parents(weak=self._parent_ref.__class__ is weakref.ref)  # same as the rest of the tree
+
+    @property
+    def _value(self):
+        self._load()
+        return self._value
+
+    def __getattr__(self, item):
+        if item.startswith("__"):
+            raise AttributeError(item)
+        self._load()
+        return getattr(self, item)
+
+    def __str__(self):
+        self._load()
+        return str(self)
+
+    def __getitem__(self, item):
+        self._load()
+        return self[item]
+
+    def __setitem__(self, key, value):
+        self._load()
+        self[key] = value
+
+    def __eq__(self, other):
+        self._load()
+        return self == other
+
+    def __bool__(self):
+        self._load()
+        return bool(self)
+
+    def __len__(self):
+        self._load()
+        return len(self)
+
+    def __iter__(self):
+        self._load()
+        return iter(self)
+
+    def _python_children(self) -> List[Node]:
+        self._load()
+        return self._python_children()
+
+    def _hashed_children(self) -> List[Node]:
+        self._load()
+        return self._hashed_children()
+
+    def _construct(self, constructor: nip.constructor.Constructor, *args, **kwargs):
+        self._load()
+        return self._construct(constructor, *args, **kwargs)
+
+    def _dump_parts(self, dumper: nip.dumper.Dumper) -> List[Union[str, Tuple[Node, nip.dumper.Dumper]]]:
+        self._load()
+        return self._dump_parts(dumper)
+
+    def _children(self) -> List[Tuple[Union[str, int, None], Node]]:
+        return []  # walkers don't parse lazy nodes
+
+
+def walk(node: Node, post_order: bool = False, with_paths: bool = False) -> Iterator[Union[Node, Tuple[str, Node]]]:
+    """Depth-first traversal of the tree without recursion.
+
+    Nodes are yielded before their children or after them with `post_order=True`.
+    With `with_paths=True`, (path, node) pairs are yielded, where path is a dotted path from `node`
+    as accepted by `Args.__getitem__`. Not parsed lazy nodes are yielded without their children.
+    """
+    if not post_order and not with_paths:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for _, child in reversed(node._children()))
+        return
+
+    stack = [("", node, False)]
+    while stack:
+        path, node, visited = stack.pop()
+        if visited:
+            yield (path, node) if with_paths else node
+            continue
+        if post_order:
+            stack.append((path, node, True))
+        else:
+            yield (path, node) if with_paths else node
+        for key, child in reversed(node._children()):
+            if with_paths and key is not None:
+                stack.append((join_path(path, key), child, False))
+            else:
+                stack.append((path, child, False))
+
+
+def fold(item, children: Callable[[Any], list], combine: Callable[[Any, list], Any]) -> Any:
+    """Computes value of a tree bottom-up without recursion.
+
+    `children(item)` gives the items which values are needed first, and `combine(item, values)`
+    gets the value of the item from their values in the same order.
+    """
+    stack = []
+    values = []
+    item_children = iter(children(item))
+    while True:
+        for child in item_children:
+            child_children = children(child)
+            if child_children:
+                stack.append((item, item_children, values))
+                item, item_children, values = child, iter(child_children), []
+                break
+            values.append(combine(child, child_children))
+        else:
+            value = combine(item, values)
+            if not stack:
+                return value
+            item, item_children, values = stack.pop()
+            values.append(value)
+
+
+def join_path(path: str, key: Union[str, int]) -> str:
+    return f"{path}.{key}" if path else str(key)
+
+
+def share_subtrees(tree: Node, max_interned: int = 64) -> Node:
+    """Makes equal subtrees of the tree one shared node (hash-consing), interns names and short strings.
+
+    Subtrees are equal if they have the same node classes, names and values of the same types.
+    Subtrees with link creations, iterators or lazy nodes are not shared. A shared node belongs to none of
+    the nodes that refer to it, so `[]` and iteration copy it for the accessing node before it can be modified
+    (as with `fork`), and the nodes that refer to it don't cache their values.
+    Nodes taken from the tree by other means (e.g. `walk`) are shared and should not be modified.
+    """
+    intern = sys.intern
+    nodes = list(walk(tree, post_order=True))  # keeps the replaced nodes alive while their ids are in use
+    shared = {}  # key of a subtree -> the shared node equal to it
+    canonical = {}  # id of a node that may be shared -> the shared node equal to it
+    uses = {}  # id of a shared node -> number of references to it
+    for node in nodes:
+        for slot in Node._CACHE_SLOTS:  # computed while the node owned its children
+            object.__setattr__(node, slot, None)
+        if node._name.__class__ is str:
+            node._name = intern(node._name)
+        value = node._value
+        if node._leaf or not isinstance(value, (Node, tuple)):
+            if value.__class__ is str and len(value) <= max_interned:
+                value = node._value = intern(value)
+            key = (
+                node.__class__,
+                node._name,
+                value.__class__,
+                value if value.__class__ in _SHARED_SCALARS else repr(value),
+            )
+        elif node.__class__ is Args:
+            args, kwargs = value
+            args[:] = [_shared_child(child, canonical, uses) for child in args]
+            kwargs = {intern(name): _shared_child(child, canonical, uses) for name, child in kwargs.items()}
+            node._value = args, kwargs
+            key = Args, node._name, tuple(map(id, args)), tuple((name, id(child)) for name, child in kwargs.items())
+            if not all(id(child) in canonical for child in args + list(kwargs.values())):
+                key = None
+        else:
+            node._value = _shared_child(value, canonical, uses)
+            key = (node.__class__, node._name, id(node._value)) if id(node._value) in canonical else None
+        if key is not None and node.__class__ not in _NOT_SHARED:
+            canonical[id(node)] = shared.setdefault(key, node)
+
+    pool = Args("shared", ([], {}))  # parent of the shared nodes, that doesn't refer to them
+    set_parent_ref = Node._parent_ref.__set__  # strong reference even with weak parents
+    for node in shared.values():
+        if uses.get(id(node), 0) > 1:
+            set_parent_ref(node, pool)
+    return tree
+
+
+_SHARED_SCALARS = (str, int, bool, type(None))  # other values are compared by repr, e.g. 0.0 == -0.0
+_NOT_SHARED = (Document, LinkCreation, Iter, Directive, Lazy)
+
+
+def _shared_child(child: Node, canonical: dict, uses: dict) -> Node:
+    child = canonical.get(id(child), child)
+    uses[id(child)] = uses.get(id(child), 0) + 1
+    return child
+
+
+def unflatten(pairs: Iterable[Tuple[str, Any]], delimiter: str = ".", tree: Node = None) -> Node:
+    """Builds a tree from (path, value) pairs as given by `iter_flat`, or sets them into `tree`.
+
+    Keys "0", "1", ... of a level become positional arguments, the other keys become keyword ones.
+    Values are converted with `nip.convert`, nodes are used as they are.
+    Pairs are grouped by path prefix, so every node of `tree` is accessed once. Missing keys are created.
+    """
+    trie = _FlatTrie(pairs, delimiter, nip.convertor.Convertor().convert)
+    if tree is None:
+        return trie.to_node()
+    _assign(trie.plan(tree, create_missing=True))
+    return tree
+
+
+class _FlatTrie:
+    """Converted values of flat pairs grouped by path prefix: nested dicts of keys with nodes as leaves.
+
+    Errors are appended to the given lists of messages, or raised as FlatError if there is no list.
+    """
+
+    def __init__(
+        self,
+        pairs: Iterable[Tuple[str, Any]],
+        delimiter: str,
+        convert: Callable[[Any], Node],
+        conflicts: List[str] = None,
+    ):
+        self.delimiter = delimiter
+        self.root = {}
+        for path, value in pairs:
+            value = convert(value)
+            if not path:
+                self.root = value
+                continue
+            level = self.root
+            *keys, last_key = path.split(delimiter)
+            for i, key in enumerate(keys):
+                level = level.setdefault(key, {})
+                if isinstance(level, Node):
+                    _report(conflicts, f"Value of '{delimiter.join(keys[: i + 1])}' is overridden by '{path}'")
+                    break
+            else:
+                if last_key in level:
+                    _report(conflicts, f"Path '{path}' is set twice or has values set inside")
+                level[last_key] = value
+
+    def to_node(self) -> Node:
+        if not self.root:
+            raise FlatError("No pairs to build a tree of")
+        return fold(self.root, _trie_children, _trie_node)
+
+    def plan(self, tree: Node, create_missing: bool, missing: List[str] = None) -> List[Tuple[Args, int, Node]]:
+        """Finds the Args to set the values into: (args, key or None to append, node) for every top trie key.
+
+        The tree is not modified, so it stays as it is if there are missing paths.
+        """
+        if isinstance(self.root, Node):
+            _report(missing, "Unable to replace the tree itself")
+            return []
+        assignments = []
+        stack = [(tree, self.root, None)]
+        while stack:
+            node, level, path = stack.pop()
+            args = _args_of(node)
+            if args is None:
+                _report(missing, f"Unable to set keys {list(level)} of '{path}': it is not a dict or a list")
+                continue
+            n_args = len(args._value[0])
+            for key in sorted(level, key=_positional_first):
+                value = level[key]
+                key_path = key if path is None else path + self.delimiter + key
+                positional = key.isdecimal()
+                index = int(key) if positional else key
+                exists = index < len(args._value[0]) if positional else key in args._value[1]
+                if exists and isinstance(value, dict):
+                    stack.append((args[index], value, key_path))
+                    continue
+                if isinstance(value, dict):
+                    value = fold(value, _trie_children, _trie_node)
+                if exists or not positional and create_missing:
+                    assignments.append((args, index, value))
+                elif positional and create_missing and index == n_args:
+                    assignments.append((args, None, value))
+                    n_args += 1
+                else:
+                    _report(missing, f"Path '{key_path}' is not found")
+        return assignments
+
+
+def _override_pairs(overrides) -> Tuple[List[Tuple[str, Node]], List[str]]:
+    """(path, node) pairs of the overrides and messages about the values that are not parsed or converted"""
+    if isinstance(overrides, dict):
+        overrides = overrides.items()
+    pairs, invalid, texts = [], [], []
+    for override in overrides:
+        if isinstance(override, str):
+            path, sep, text = override.partition("=")
+            if not sep:
+                invalid.append(f"Override '{override}' is not of the form 'path=value'")
+                continue
+            texts.append((len(pairs), text.strip()))
+            override = path.strip(), None
+        pairs.append(tuple(override))
+    parsed = set()
+    for (i, _), value in zip(texts, _parse_values([text for _, text in texts])):
+        pairs[i] = pairs[i][0], value
+        parsed.add(i)
+    convertor = nip.convertor.Convertor()
+    nodes = []
+    for i, (path, value) in enumerate(pairs):
+        if isinstance(value, Exception):
+            invalid.append(f"Value of '{path}' is not parsed: {value}")
+            continue
+        if i not in parsed:
+            try:
+                value = convertor.convert(value)
+            except nip.convertor.ConvertorError as e:
+                invalid.append(f"Value of '{path}' is not converted: {e}")
+                continue
+        nodes.append((path, value))
+    return nodes, invalid
+
+
+def _parse_values(texts: List[str]) -> List[Union[Node, Exception]]:
+    """Parses the texts as values of one document, or one by one if some of them fail"""
+    if all("\n" not in text for text in texts):
+        try:
+            document = nip.parser.Parser().parse_string("".join(f"o{i}: {text}\n" for i, text in enumerate(texts)))
+            values = list(document._value._value[1].values()) if texts else []
+            if len(values) == len(texts):
+                for value in values:
+                    value._parent = None
+                return values
+        except Exception:
+            pass
+    values = []
+    for text in texts:
+        try:
+            value = nip.parser.Parser().parse_string(f"o: {text}")._value["o"]
+            value._parent = None
+        except Exception as e:
+            value = e
+        values.append(value)
+    return values
+
+
+def _assign(assignments: List[Tuple[Args, Union[int, str, None], Node]]):
+    for args, key, node in assignments:
+        if key is None:
+            args.append(node)
+        else:
+            args[key] = node
+
+
+def _positional_first(key: str) -> float:
+    return int(key) if key.isdecimal() else float("inf")  # sort is stable, so the other keys keep their order
+
+
+def _report(messages: Union[List[str], None], message: str):
+    if messages is None:
+        raise FlatError(message)
+    messages.append(message)
+
+
+def _trie_children(level: Union[dict, Node]) -> list:
+    return list(level.values()) if level.__class__ is dict else ()
+
+
+def _trie_node(level: Union[dict, Node], nodes: List[Node]) -> Node:
+    if level.__class__ is not dict:
+        return level
+    args = Args("args", ([], {}))
+    set_parent_ref = Node._parent_ref.__set__
+    for key, node in zip(level, nodes):
+        if node._parent_ref is not None:  # a part of another tree
+            node = node._clone()
+        set_parent_ref(node, args)
+        if key == str(len(args._value[0])):
+            args._value[0].append(node)
+        else:
+            args._value[1][key] = node
+    return args
+
+
+def _args_of(node: Node) -> Union[Args, None]:
+    """Args that keeps the items of the node: the node itself or the value of a tag, link creation or document"""
+    while True:
+        if node.__class__ is Lazy:
+            node._load()
+        if isinstance(node, Args):
+            return node
+        if node._leaf or isinstance(node, Iter) or not isinstance(node._value, Node):
+            return None
+        node = node._own_value()
+
+
+class FlatError(Exception):
+    pass
+
+
+class OverrideError(FlatError):
+    def __init__(self, missing: List[str], conflicts: List[str], invalid: List[str]):
+        self.missing = missing
+        self.conflicts = conflicts
+        self.invalid = invalid
+
+    def __str__(self):
+        return "Unable to apply the overrides:\n" + "\n".join(self.invalid + self.conflicts + self.missing)
+
+
+def _python_children(node: Node) -> List[Node]:
+    return () if node._python is not None else node._python_children()
+
+
+def _python_value(node: Node, values: list):
+    python = node._python
+    if python is None:
+        python = node._python_value(values)
+        if not node._leaf and _owns_cached(node, node._python_children(), "_python"):  # leaves are not computed
+            node._python = python
+    return python
+
+
+def _python_copy_children(value) -> list:
+    if value.__class__ is dict:
+        return list(value.values())
+    if value.__class__ in (list, tuple):
+        return value
+    return ()
+
+
+def _python_copy(value, items: list):
+    if value.__class__ is dict:
+        return dict(zip(value, items))
+    if value.__class__ is list:
+        return list(items)
+    if value.__class__ is tuple:
+        return tuple(items)
+    return value
+
+
+def _fingerprint_children(node: Node) -> List[Node]:
+    if node._fingerprint is not None:
+        return ()
+    return [child for child in node._hashed_children() if not child._leaf]  # leaves are hashed by their parents
+
+
+def _fingerprint_digest(node: Node, digests: List[str]) -> str:
+    fingerprint = node._fingerprint
+    if fingerprint is None:
+        children = node._hashed_children()
+        digests = iter(digests)
+        parts = [repr(node._hashed_header())]
+        for child in children:
+            if not child._leaf:
+                parts.append(next(digests))
+            elif child.__class__ is Value:  # the most common case
+                value = child._value
+                parts.append(f"<{_CANONICAL_SCALARS.get(value.__class__, _canonical)(value)}>")
+            else:
+                parts.append(repr(child._hashed_header()))
+        fingerprint = hashlib.blake2b("".join(parts).encode(), digest_size=16).hexdigest()
+        if _owns_cached(node, children, "_fingerprint"):
+            node._fingerprint = fingerprint
+    return fingerprint
+
+
+def _owns_cached(node: Node, children: List[Node], slot: str) -> bool:
+    """Whether the value of the node may be cached in the slot: its children are its own and have cached values.
+
+    Otherwise changes of a shared node (e.g. one taken from a tree before it was forked) would leave it stale.
+    """
+    return all(child._leaf or getattr(child, slot) is not None and node._owns(child) for child in children)
+
+
+def _sorted_keys(kwargs: dict) -> list:
+    try:
+        return sorted(kwargs)
+    except TypeError:  # keys of different types
+        return sorted(kwargs, key=repr)
+
+
+def _canonical(value) -> str:
+    """String that is the same for equal python values of the nodes"""
+    to_string = _CANONICAL_SCALARS.get(value.__class__)
+    if to_string is not None:
+        return to_string(value)
+    if isinstance(value, list):
+        return "[" + ", ".join(map(_canonical, value)) + "]"
+    if isinstance(value, tuple):
+        return "(" + ", ".join(map(_canonical, value)) + ")"
+    if isinstance(value, dict):
+        return "{" + ", ".join(sorted(f"{_canonical(key)}: {_canonical(item)}" for key, item in value.items())) + "}"
+    return repr(f"{value.__class__.__qualname__}({value!r})")
+
+
+_CANONICAL_SCALARS = {  # 1 == 1.0, but bools are not numbers in configs
+    str: repr,
+    int: str,
+    bool: lambda value: f"bool:{value}",
+    float: lambda value: str(int(value)) if value.is_integer() else repr(value),
+    type(None): repr,
+}
+
+
+def _write_dump(node: Node, dumper: nip.dumper.Dumper) -> str:
+    """Expands dump parts of the nodes in place and joins the strings once, so the time is linear in output size"""
+    strings = []
+    stack = [(node, dumper)]
+    while stack:
+        part = stack.pop()
+        if isinstance(part, str):
+            strings.append(part)
+        else:
+            node, dumper = part
+            stack.extend(reversed(node._dump_parts(dumper)))
+    return "".join(strings)
+
+
+def read_sections(stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[List[Tuple[str, int, str]], None]:
+    """Splits the rest of the stream into top-level `key: value` pairs without parsing the values.
+
+    Returns (key, number of the first line, text of the lines) for every pair and moves the stream to the end.
+    Returns None and keeps the stream position if the rest is not a top-level dict.
+    """
+    if not stream or stream.pos != 0:
+        return None
+    start_line = stream.n
+    keys = []
+    for line in stream.top_level_lines():
+        stream.seek_line(line)
+        read_tokens = stream.peek(tokens.Name, tokens.Operator(": "))
+        if read_tokens is None:
+            stream.seek_line(start_line)
+            return None
+        keys.append((read_tokens[0]._value, line))
+
+    ends = [stream.line_starts[line] for _, line in keys[1:]] + [len(stream.buffer)]
+    sections = []
+    seen_keys = set()
+    for (key, line), end in zip(keys, ends):
+        if parser.strict and key in seen_keys:
+            stream.seek_line(line)
+            raise nip.parser.ParserError(
+                stream,
+                f"Dict key overwriting is forbidden in `strict` " f"mode. Overwritten key: '{key}'.",
+            )
+        seen_keys.add(key)
+        sections.append((key, line, stream.buffer[stream.line_starts[line] : end]))
+    stream.seek_line(len(stream.line_starts))
+    return sections
+
+
+def read_section(source: str, line: int, parser: nip.parser.Parser) -> Node:
+    """Reads value of a top-level `key: value` pair. `line` is the number of its first line in the config."""
+    stream = nip.stream.Stream(source, memoize=parser.memoize_tokens)
+    stream.peek(tokens.Name, tokens.Operator(": "))
+    stream.step()
+    parser.last_indent = 0  # as if it is read by the top-level Args
+    try:
+        value = read_node(stream, parser)
+        if stream:
+            raise nip.parser.ParserError(stream, "Unexpected indent")
+    except (nip.parser.ParserError, nip.stream.StreamError) as e:
+        e.line += line
+        raise
+    return value
+
+
+_OPERATOR_NODES = {
+    "!!": Directive,
+    "&": LinkCreation,
+    "*": Link,
+    "!&": Class,
+    "!": Tag,
+    "@": Iter,
+}
+
+
+def _try_read(node_class, stream: nip.stream.Stream, parser: nip.parser.Parser) -> Union[Node, None]:
+    node = node_class.read(stream, parser)
+    if node is None:
+        parser.backtracks += 1
+    return node
 
 
 def read_node(stream: nip.stream.Stream, parser: nip.parser.Parser) -> Node:
-    value = (
-        Directive.read(stream, parser)
-        or LinkCreation.read(stream, parser)
-        or Link.read(stream, parser)
-        or Class.read(stream, parser)
-        or Tag.read(stream, parser)
-        or Iter.read(stream, parser)
-        or Args.read(stream, parser)
-        or FString.read(stream, parser)
-        or Nothing.read(stream, parser)
-        or InlinePython.read(stream, parser)
-        or Value.read(stream, parser)
-    )
+    """Reads node using the lookahead character to choose readers.
+
+    Readers are tried in the order of precedence: operator nodes (Directive, LinkCreation, Link, Class, Tag, Iter),
+    Args, FString, Nothing, InlinePython and Value. Readers that can't start with the lookahead character are skipped.
+    """
+    char = stream.lookahead()
+    value = None
+    if char in ("!", "&", "*", "@"):
+        operator = stream.peek(tokens.Operator)[0]
+        value = _try_read(_OPERATOR_NODES[operator._value], stream, parser)
+
+    if value is None:
+        if char == "-" or char.isalpha():
+            value = _try_read(Args, stream, parser)
+        elif stream and stream.pos > parser.last_indent:
+            parser.last_indent = stream.pos  # failed Args.read claims the indent as well
+
+    if value is None and char in ("f", "r"):
+        value = _try_read(FString, stream, parser)
+
+    if value is None:
+        value = _try_read(Nothing, stream, parser)
+
+    if value is None and char == "`":
+        value = _try_read(InlinePython, stream, parser)
+
+    if value is None:
+        value = _try_read(Value, stream, parser)
 
     if value is None:
         raise nip.parser.ParserError(stream, "Wrong right value")
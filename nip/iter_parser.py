@@ -30,6 +30,7 @@ class IterParser:  # mb: insert this functionality into Parser (save parsed tree
             for index, group_name in zip(indexes, group_names):
                 for iterator in iter_groups[group_name]:
                     iterator._return_index = index
+                    iterator._invalidate()
             yield element
 
     def __iter__(self):
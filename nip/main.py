@@ -1,20 +1,28 @@
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Union, Any, Iterable, Callable, Optional
+from typing import Union, Any, Iterable, Callable, Optional, List, Sequence
 
 from . import elements
+from .cache import parse_cache, DiskCache
 from .constructor import Constructor
 from .convertor import Convertor
 from .dumper import Dumper
 from .iter_parser import IterParser
 from .non_seq_constructor import NonSequentialConstructor
 from .parser import Parser
+from .plan import compile as compile_plan
 
 __all__ = [
     "parse",
     "parse_string",
+    "parse_many",
     "construct",
+    "construct_async",
     "load",
     "load_string",
+    "load_many",
     "run",
     "dump",
     "dump_string",
@@ -27,6 +35,11 @@ def parse(
     always_iter: bool = False,
     implicit_fstrings: bool = True,
     strict: bool = False,
+    cache: bool = False,
+    disk_cache: Union[bool, str, Path] = False,
+    lazy: bool = False,
+    weak_parents: bool = False,
+    share_nodes: bool = False,
 ) -> Union[elements.Node, Iterable[elements.Node]]:
     """Parses config providing Element tree
 
@@ -40,13 +53,39 @@ def parse(
         If True, all quoted strings will be treated as python f-strings.
     strict:
         It True, checks overwriting dict keys and positioning (`args` before `kwargs`).
+    cache:
+        If True, the tree is taken from `nip.cache.parse_cache` while the file is not changed.
+        Returned tree is a copy and can be modified.
+    disk_cache: bool or str or Path
+        If True, parsed tree is saved to `__nipcache__/<name>.nipc` next to the config and loaded from there
+        while neither the config nor inserted files are changed. Directory for `.nipc` files may be specified instead.
+    lazy:
+        If True, values of the top-level keys are parsed only when accessed.
+        Syntax errors inside them are raised on the first access as well.
+    weak_parents:
+        If True, nodes refer to their parents weakly, so dropped trees are freed without the cyclic garbage collector.
+        Parsed Document has to be kept while its parts are used.
+    share_nodes:
+        If True, equal subtrees (e.g. of the files inserted several times) are kept as one shared node
+        and names and short strings are interned. Shared nodes are copied when they are accessed with `[]`.
 
     Returns
     -------
     tree: Element or Iterable[Element]
     """
-    parser = Parser(implicit_fstrings=implicit_fstrings, strict=strict)
-    tree = parser.parse(path)
+    parser = Parser(
+        implicit_fstrings=implicit_fstrings,
+        strict=strict,
+        lazy=lazy,
+        weak_parents=weak_parents,
+        share_nodes=share_nodes,
+    )
+    if cache:
+        tree = parse_cache.parse(parser, path)
+    elif disk_cache:
+        tree = DiskCache(None if disk_cache is True else disk_cache).parse(parser, path)
+    else:
+        tree = parser.parse(path)
     if parser.has_iterators() or always_iter:
         return IterParser(parser).iter_configs(tree)
     return tree
@@ -57,6 +96,8 @@ def parse_string(
     always_iter: bool = False,
     implicit_fstrings: bool = True,
     strict: bool = False,
+    weak_parents: bool = False,
+    share_nodes: bool = False,
 ) -> Union[elements.Node, Iterable[elements.Node]]:
     """Parses config providing Element tree
 
@@ -70,23 +111,116 @@ def parse_string(
         If True, all quoted strings will be treated as python f-strings.
     strict:
         It True, checks overwriting dict keys and positioning (`args` before `kwargs`).
+    weak_parents:
+        If True, nodes refer to their parents weakly, so dropped trees are freed without the cyclic garbage collector.
+        Parsed Document has to be kept while its parts are used.
+    share_nodes:
+        If True, equal subtrees (e.g. of the files inserted several times) are kept as one shared node
+        and names and short strings are interned. Shared nodes are copied when they are accessed with `[]`.
 
     Returns
     -------
     tree: Element or Iterable[Element]
     """
-    parser = Parser(implicit_fstrings=implicit_fstrings, strict=strict)
+    parser = Parser(
+        implicit_fstrings=implicit_fstrings, strict=strict, weak_parents=weak_parents, share_nodes=share_nodes
+    )
     tree = parser.parse_string(config_string)
     if parser.has_iterators() or always_iter:
         return IterParser(parser).iter_configs(tree)
     return tree
 
 
+_process_insert_cache = {}  # inserted files parsed by the current worker of `parse_many(processes=True)`
+
+
+def _init_process_worker():
+    _process_insert_cache.clear()
+
+
+def _parse_timed(path, implicit_fstrings, strict, weak_parents, insert_cache):
+    parser = Parser(implicit_fstrings=implicit_fstrings, strict=strict, weak_parents=weak_parents)
+    parser.insert_cache = _process_insert_cache if insert_cache is None else insert_cache
+    start = time.perf_counter()
+    tree = parser.parse(path)
+    return (tree, parser.iterators), time.perf_counter() - start  # pickled together to keep iterators in the tree
+
+
+def parse_many(
+    paths: Sequence[Union[str, Path]],
+    workers: Optional[int] = None,
+    processes: bool = False,
+    always_iter: bool = False,
+    implicit_fstrings: bool = True,
+    strict: bool = False,
+    weak_parents: bool = False,
+    return_timings: bool = False,
+) -> Union[List[Union[elements.Node, Iterable[elements.Node]]], tuple]:
+    """Parses several configs on a pool of workers
+
+    Parameters
+    ----------
+    paths: sequence of str or Path
+        Paths to config files.
+    workers: int, optional
+        Number of threads or processes. Defaults to the number of CPUs.
+    processes: bool
+        If True, configs are parsed on a process pool. Otherwise, threads are used.
+    always_iter: bool
+        If True will always return iterators over configs.
+    implicit_fstrings: boot, default: True
+        If True, all quoted strings will be treated as python f-strings.
+    strict:
+        It True, checks overwriting dict keys and positioning (`args` before `kwargs`).
+    weak_parents:
+        If True, nodes refer to their parents weakly, so dropped trees are freed without the cyclic garbage collector.
+        Parsed Document has to be kept while its parts are used.
+    return_timings: bool
+        If True, parsing time of every config in seconds is returned as well.
+
+    Returns
+    -------
+    trees or (trees, timings): list of Element or Iterable[Element] or (list, list of float)
+        Results are in the order of `paths`.
+
+    Notes
+    -----
+    Files inserted with `!!insert` are parsed once and shared by all the configs.
+    With `processes=True` they are shared by the configs parsed in the same process.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if processes:
+        pool = ProcessPoolExecutor(workers, initializer=_init_process_worker)
+        insert_cache = None
+    else:
+        pool = ThreadPoolExecutor(workers)
+        insert_cache = {}
+    with pool:
+        futures = [
+            pool.submit(_parse_timed, path, implicit_fstrings, strict, weak_parents, insert_cache) for path in paths
+        ]
+        parsed = [future.result() for future in futures]
+
+    trees = []
+    for (tree, iterators), _ in parsed:
+        if iterators or always_iter:
+            parser = Parser()
+            parser.iterators = iterators
+            tree = IterParser(parser).iter_configs(tree)
+        trees.append(tree)
+    if return_timings:
+        return trees, [timing for _, timing in parsed]
+    return trees
+
+
 def construct(
     config: elements.Node,
     base_config: elements.Node = None,
     strict_typing: bool = False,
     nonsequential: bool = True,
+    typing_depth: str = "full",
+    workers: Optional[int] = None,
 ) -> Any:
     """Constructs python object based on config and known nip-objects
 
@@ -101,19 +235,65 @@ def construct(
     nonsequential:
         If True, allows to use links before creation.
         Always true if base_config is specified.
+    typing_depth:
+        How arguments of tagged objects are checked against the annotations of their builders: "off",
+        "shallow" (types of containers only), "sampled" (first item of each container) or "full" (all the items).
+    workers:
+        If specified, independent tagged objects are constructed concurrently on that many threads.
+        Links are resolved non-sequentially and every link is constructed once. If several objects fail,
+        the error is the one that construction without workers would raise.
 
     Returns
     -------
     obj: Any
     """
+    if workers:
+        plan = compile_plan(config, base_config=base_config, strict_typing=strict_typing, typing_depth=typing_depth)
+        return plan(workers=workers)
     if nonsequential or base_config is not None:
         base_config = base_config or config._get_root()
-        constructor = NonSequentialConstructor(base_config, strict_typing=strict_typing)
+        constructor = NonSequentialConstructor(base_config, strict_typing=strict_typing, typing_depth=typing_depth)
     else:
-        constructor = Constructor(strict_typing=strict_typing)
+        constructor = Constructor(strict_typing=strict_typing, typing_depth=typing_depth)
     return constructor.construct(config)
 
 
+async def construct_async(
+    config: elements.Node,
+    base_config: elements.Node = None,
+    strict_typing: bool = False,
+    typing_depth: str = "full",
+    executor: Optional[Executor] = None,
+    offload: bool = False,
+) -> Any:
+    """Constructs python object based on config without blocking the event loop
+
+    Results of coroutine builders are awaited and independent objects are constructed concurrently.
+    Links are resolved non-sequentially and every link is constructed once.
+
+    Parameters
+    ----------
+    config: Element
+        Config node to be constructed.
+    base_config:
+        Base config, in case of construction a part of a config with external links.
+    strict_typing:
+        If True, raises Exception when typing mismatch.
+    typing_depth:
+        How arguments of tagged objects are checked against the annotations of their builders, as in `construct`.
+    executor:
+        Executor for the builders with `offload`. The default executor of the event loop if not specified.
+    offload:
+        If True, builders that are not coroutine functions are run in the executor.
+
+    Returns
+    -------
+    obj: Any
+    """
+    plan = compile_plan(config, base_config=base_config, strict_typing=strict_typing, typing_depth=typing_depth)
+    return await plan.run_async(executor=executor, offload=offload)
+
+
 def _iter_load(configs, strict_typing, nonsequential):  # Otherwise load() will always be an iterator
     for config in configs:
         yield construct(config, strict_typing=strict_typing, nonsequential=nonsequential)
@@ -124,6 +304,7 @@ def load(
     always_iter: bool = False,
     strict: bool = False,
     nonsequential: bool = False,
+    cache: bool = False,
 ) -> Union[Any, Iterable[Any]]:
     """Parses config and constructs python object
     Parameters
@@ -136,12 +317,14 @@ def load(
         If True, raises Exception when typing mismatch or overwriting dict key.
     nonsequential:
         If True, allows to use links before creation.
+    cache:
+        If True, parsed config is taken from `nip.cache.parse_cache` while the file is not changed.
 
     Returns
     -------
     obj: Any or Iterable[Any]
     """
-    config = parse(path, always_iter, strict=strict)
+    config = parse(path, always_iter, strict=strict, cache=cache)
 
     if isinstance(config, Iterable):
         return _iter_load(config, strict, nonsequential)
@@ -179,6 +362,52 @@ def load_string(
     return construct(config, strict_typing=strict, nonsequential=nonsequential)
 
 
+def load_many(
+    paths: Sequence[Union[str, Path]],
+    workers: Optional[int] = None,
+    processes: bool = False,
+    always_iter: bool = False,
+    strict: bool = False,
+    nonsequential: bool = False,
+    return_timings: bool = False,
+) -> Union[List[Union[Any, Iterable[Any]]], tuple]:
+    """Parses configs on a pool of workers and constructs python objects
+    Parameters
+    ----------
+    paths: sequence of str or Path
+        Paths to config files.
+    workers: int, optional
+        Number of threads or processes used for parsing. Defaults to the number of CPUs.
+    processes: bool
+        If True, configs are parsed on a process pool. Otherwise, threads are used.
+    always_iter: bool
+        If True will always return iterators.
+    strict:
+        If True, raises Exception when typing mismatch or overwriting dict key.
+    nonsequential:
+        If True, allows to use links before creation.
+    return_timings: bool
+        If True, parsing time of every config in seconds is returned as well.
+
+    Returns
+    -------
+    objs or (objs, timings): list of Any or Iterable[Any] or (list, list of float)
+        Results are in the order of `paths`. Objects are constructed in the calling thread.
+    """
+    configs, timings = parse_many(
+        paths, workers, processes, always_iter=always_iter, strict=strict, return_timings=True
+    )
+    objs = []
+    for config in configs:
+        if isinstance(config, Iterable):
+            objs.append(_iter_load(config, strict, nonsequential))
+        else:
+            objs.append(construct(config, strict_typing=strict, nonsequential=nonsequential))
+    if return_timings:
+        return objs, timings
+    return objs
+
+
 def dump(path: Union[str, Path], obj: Union[elements.Node, object]):
     """Dumps config tree to file.
 
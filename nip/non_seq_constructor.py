@@ -44,21 +44,18 @@ class NonSequentialConstructor(Constructor):
         ignore_rewriting=False,
         load_builders=True,
         strict_typing=False,
+        typing_depth="full",
     ):
-        super().__init__(ignore_rewriting, load_builders, strict_typing)
+        super().__init__(ignore_rewriting, load_builders, strict_typing, typing_depth)
         self.vars = VarsDict(self)
         self.links = {}
         self._find_links(base_config)
 
     def _find_links(self, node: "nip.elements.Node"):
-        if isinstance(node, nip.elements.LinkCreation):
-            assert node._name not in self.links, "Redefined link."
-            self.links[node._name] = node
-        if isinstance(node, nip.elements.Args):
-            for sub_node in node:
-                self._find_links(sub_node)
-        if isinstance(node._value, nip.elements.Node):
-            self._find_links(node._value)
+        for sub_node in nip.elements.walk(node):  # values with link creations are never lazy
+            if isinstance(sub_node, nip.elements.LinkCreation):
+                assert sub_node._name not in self.links, "Redefined link."
+                self.links[sub_node._name] = sub_node
 
 
 class NonSequentialConstructorError(Exception):
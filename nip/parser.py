@@ -11,22 +11,43 @@ class Parser:
         implicit_fstrings: bool = True,
         strict: bool = False,
         sequential_links: bool = False,
+        memoize_tokens: bool = False,
+        lazy: bool = False,
+        weak_parents: bool = False,
+        share_nodes: bool = False,
     ):
         self.links = []
         self.iterators = []
         self.link_replacements = {}  # used with !!insert directive
+        self.dependencies = []  # resolved paths of all the files inserted with !!insert directive in the last parse
+        self.path = None  # resolved path of the parsed file
+        # Shared by the parsers of inserted files
+        self.include_graph = {}  # includer path (None for a string) -> resolved paths it inserts, in the last parse
+        self.insert_cache = {}  # resolved path -> (pickled inserted tree, its dependencies, their states)
+        self.insert_chain = []  # paths of the files that are inserting the currently parsed one
         self.implicit_fstrings = implicit_fstrings
         self.strict = strict
         self.sequential_links = sequential_links
+        self.memoize_tokens = memoize_tokens
+        self.lazy = lazy  # top-level values are parsed on the first access
+        self.weak_parents = weak_parents  # nodes refer to their parents weakly, so the tree has no reference cycles
+        self.share_nodes = share_nodes  # equal subtrees of the parsed tree are one shared node
         self.last_indent = -1
         self.stack = []
+        self.backtracks = 0  # failed node reader attempts during parsing
+        self.memo_hits = 0  # token reads answered by the stream memo table (with `memoize_tokens`)
+        self.memo_misses = 0
 
     def parse(self, path: Union[str, Path]):
         path = Path(path)
+        self.path = path.resolve()
         with path.open() as f_stream:
             string_representation = f_stream.read()
 
-        tree = self.parse_string(string_representation)
+        try:
+            tree = self.parse_string(string_representation)
+        finally:
+            self.path = None  # next `parse_string` parses a string
         tree._path = path
         return tree
 
@@ -34,13 +55,29 @@ class Parser:
         return self.parse(path)
 
     def parse_string(self, string):
-        stream = Stream(string)  # mb: add stream to parser and log errors more convenient
-        tree = elements.Document.read(stream, self)
+        self.last_indent = -1
+        self.backtracks = 0
+        if not self.insert_chain:  # top-level parse, inserted files are parsed by other parsers
+            self.dependencies = []
+            self.include_graph = {}
+        stream = Stream(string, memoize=self.memoize_tokens)  # mb: add stream to parser and log errors more convenient
+        try:
+            tree = elements.Document.read(stream, self)
+        finally:
+            self.memo_hits = stream.memo_hits
+            self.memo_misses = stream.memo_misses
         if stream:
             raise ParserError(stream, "Wrong statement.")
-        tree._update_parents()
+        tree._update_parents(weak=self.weak_parents)
+        if self.share_nodes:
+            elements.share_subtrees(tree)
         return tree
 
+    @property
+    def memo_hit_rate(self) -> float:
+        reads = self.memo_hits + self.memo_misses
+        return self.memo_hits / reads if reads else 0.0
+
     def has_iterators(self) -> bool:
         return len(self.iterators) > 0
 
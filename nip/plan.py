@@ -0,0 +1,387 @@
+"""Construction plans: configs compiled into flat lists of steps that are run without walking the tree."""
+
+import asyncio
+import builtins
+import concurrent.futures
+import inspect
+import symtable
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import nip.elements as elements
+import nip.utils
+from .constructor import ConstructorError
+from .non_seq_constructor import NonSequentialConstructor, NonSequentialConstructorError
+
+
+class Step(ABC):
+    """Construction of one node from the values of the steps it depends on"""
+
+    __slots__ = ("index", "node", "deps")
+
+    def __init__(self, node: elements.Node, deps: Tuple[int, ...]):
+        self.index = -1  # position of the value in the plan, set when the step is added
+        self.node = node
+        self.deps = deps
+
+    @abstractmethod
+    def run(self, values: list) -> Any:
+        pass
+
+    async def run_async(self, values: list, executor: Union[concurrent.futures.Executor, None], offload: bool) -> Any:
+        return self.run(values)
+
+
+class ConstructionPlan:
+    """Steps of constructing a config in the order of `nip.construct`. Calling the plan constructs new objects.
+
+    `values` of a run have a slot per step or constant, steps take the values of their `deps` from it.
+    """
+
+    def __init__(self, constants: list, steps: List[Step], result: int):
+        self.constants = constants  # values that are the same for every run and placeholders of the steps
+        self.steps = steps
+        self.result = result
+
+    def __call__(self, workers: int = None) -> Any:
+        """Constructs the config. With `workers`, independent steps are run on a pool of that many threads."""
+        if workers:
+            return self._run_parallel(workers)
+        values = self.constants.copy()
+        for step in self.steps:
+            values[step.index] = step.run(values)
+        return values[self.result]
+
+    def _run_parallel(self, workers: int) -> Any:
+        """Runs every step once its deps are done. Errors are the same as of the sequential run:
+        after a step fails, only the steps before it are started, and the error of the first failed step is raised.
+        """
+        values = self.constants.copy()
+        steps = {step.index: step for step in self.steps}
+        waiting = {}  # index of a step -> number of its deps that are not done
+        dependents = {index: [] for index in steps}
+        for step in self.steps:
+            deps = {dep for dep in step.deps if dep in steps}
+            waiting[step.index] = len(deps)
+            for dep in deps:
+                dependents[dep].append(step)
+        ready = [step for step in self.steps if waiting[step.index] == 0]
+        failed = None  # (index, exception) of the first failed step
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            running = {}
+            while ready or running:
+                for step in ready:
+                    if failed is None or step.index < failed[0]:
+                        running[pool.submit(step.run, values)] = step
+                ready = []
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        values[step.index] = future.result()
+                    except Exception as e:
+                        if failed is None or step.index < failed[0]:
+                            failed = step.index, e
+                        continue
+                    for dependent in dependents[step.index]:
+                        waiting[dependent.index] -= 1
+                        if waiting[dependent.index] == 0:
+                            ready.append(dependent)
+        if failed is not None:
+            raise failed[1]
+        return values[self.result]
+
+    async def run_async(self, executor: concurrent.futures.Executor = None, offload: bool = False) -> Any:
+        """Constructs the config in the running event loop with a task per step that waits for the steps it depends on.
+
+        Results of coroutine builders are awaited. With `offload`, other builders are run in the `executor`
+        (the default executor of the loop if it is None) instead of the loop itself.
+        Errors are the same as of the sequential run, as with `workers`.
+        """
+        values = self.constants.copy()
+        tasks = {}
+        succeeded = set()
+        failed = {}  # index of a failed step -> its exception
+
+        async def run(step: Step):
+            deps = [tasks[dep] for dep in step.deps if dep in tasks]
+            if deps:
+                await asyncio.wait(deps)
+            if any(dep not in succeeded for dep in step.deps if dep in tasks) or failed and min(failed) < step.index:
+                return
+            try:
+                values[step.index] = await step.run_async(values, executor, offload)
+            except Exception as e:
+                failed[step.index] = e
+                return
+            succeeded.add(step.index)
+
+        try:
+            for step in self.steps:
+                tasks[step.index] = asyncio.ensure_future(run(step))
+            if tasks:
+                await asyncio.wait(tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        if failed:
+            raise failed[min(failed)]
+        return values[self.result]
+
+    def __len__(self):
+        return len(self.steps)
+
+
+def compile(
+    config: elements.Node,
+    base_config: elements.Node = None,
+    strict_typing: bool = False,
+    typing_depth: str = "full",
+) -> ConstructionPlan:
+    """Compiles config into a plan that constructs the same objects as `nip.construct(config)` on every call.
+
+    Links, iterator indices and builders are resolved and inline python is compiled once, so the calls
+    neither walk the tree nor look anything up. Builders registered after compiling are not used by the plan.
+
+    Parameters
+    ----------
+    config: Node
+        Config node to be constructed.
+    base_config:
+        Base config with the links used by the config. The root of the config by default.
+    strict_typing:
+        If True, raises Exception when typing mismatch.
+    typing_depth:
+        How arguments of tagged objects are checked against the annotations of their builders, as in `construct`.
+
+    Returns
+    -------
+    plan: ConstructionPlan
+        Callable that constructs the config.
+    """
+    base_config = base_config or config._get_root()
+    constructor = NonSequentialConstructor(base_config, strict_typing=strict_typing, typing_depth=typing_depth)
+    return _PlanCompiler(constructor).compile(config)
+
+
+class _PlanCompiler:
+    """Builds steps in the order of `NonSequentialConstructor`: links are compiled where they are used first"""
+
+    def __init__(self, constructor: NonSequentialConstructor):
+        self.constructor = constructor
+        self.constants = []
+        self.steps = []
+        self.links = {}  # name of a compiled link -> index of its value
+        self.in_progress = set()
+
+    def compile(self, config: elements.Node) -> ConstructionPlan:
+        result = elements.fold(config, self._children, self._combine)
+        return ConstructionPlan(self.constants, self.steps, result)
+
+    def _constant(self, value: Any) -> int:
+        self.constants.append(value)
+        return len(self.constants) - 1
+
+    def _add(self, step: Step) -> int:
+        step.index = self._constant(None)
+        self.steps.append(step)
+        return step.index
+
+    def _children(self, node: elements.Node) -> list:
+        if node.__class__ is elements.Lazy:
+            node._load()
+        if isinstance(node, elements.LinkCreation):
+            return [] if node._name in self.links else [node._value]
+        if isinstance(node, elements.Link):
+            if node._name in self.links:
+                return []
+            if node._name not in self.constructor.links:
+                raise NonSequentialConstructorError(f"Unresolved link '{node._name}'")
+            if node._name in self.in_progress:
+                raise NonSequentialConstructorError(f"Recursive construction of '{node._name}'.")
+            self.in_progress.add(node._name)
+            return [self.constructor.links[node._name]]
+        if isinstance(node, elements.Tag) and isinstance(node._value, elements.Args):
+            return node._value._value[0] + list(node._value._value[1].values())  # arguments are passed as they are
+        if isinstance(node, elements.Iter):
+            if node._return_index == -1:
+                raise Exception("Iterator index was not specified by IterParser")
+            return [node._selected()] if isinstance(node._value, elements.Args) else []
+        if isinstance(node, (elements.InlinePython, elements.FString)):
+            return [self.constructor.links[name] for name in _preloaded_links(_source(node), self.constructor.links)]
+        if isinstance(node, (elements.Document, elements.Tag, elements.Class)):
+            return [node._value]
+        if isinstance(node, elements.Args):
+            return node._value[0] + list(node._value[1].values())
+        return []
+
+    def _combine(self, node: elements.Node, values: List[int]) -> int:
+        if isinstance(node, elements.LinkCreation):
+            if node._name not in self.links:  # or it was compiled inside itself and that one is used
+                self.links[node._name] = values[0]
+            return self.links[node._name]
+        if isinstance(node, elements.Link):
+            self.in_progress.discard(node._name)
+            return self.links[node._name]
+        if isinstance(node, elements.Value):
+            return self._constant(node._value)
+        if isinstance(node, elements.Nothing):
+            return self._constant(node)
+        if isinstance(node, elements.Document):
+            return values[0]
+        if isinstance(node, elements.Iter):
+            if isinstance(node._value, list):
+                return self._constant(node._value[node._return_index])
+            if isinstance(node._value, elements.Args):
+                return values[0]
+            raise ConstructorError(node, (), {}, "Unexpected iter value type")
+        builders = self.constructor.builders
+        if isinstance(node, elements.Tag):
+            if isinstance(node._value, elements.Args):
+                n_args = len(node._value._value[0])
+                named = tuple(zip(node._value._value[1], values[n_args:]))
+                return self._add(
+                    _TagStep(node, builders.get(node._name), tuple(values[:n_args]), named, self.constructor)
+                )
+            return self._add(_TagStep(node, builders.get(node._name), None, values[0], self.constructor))
+        if isinstance(node, elements.Class):
+            return self._add(_ClassStep(node, builders.get(node._name), values[0]))
+        if isinstance(node, elements.Args):
+            n_args = len(node._value[0])
+            return self._add(_ArgsStep(node, tuple(values[:n_args]), tuple(zip(node._value[1], values[n_args:]))))
+        if isinstance(node, (elements.InlinePython, elements.FString)):
+            code = builtins.compile(_source(node), "<nip>", "eval")
+            return self._add(_EvalStep(node, code, tuple(self.links.items()), self.constructor))
+        raise ConstructorError(node, (), {}, f"Unable to compile {node.__class__.__name__} node")
+
+
+class _TagStep(Step):
+    __slots__ = ("builder", "args", "kwargs", "strict_typing", "typing_depth")
+
+    def __init__(
+        self,
+        node: elements.Tag,
+        builder: Union[Callable, None],
+        args: Union[Tuple[int, ...], None],
+        kwargs: Union[Tuple[Tuple[str, int], ...], int],
+        constructor: NonSequentialConstructor,
+    ):
+        """`args` are None if the tag has a single argument, then `kwargs` is the index of its value"""
+        deps = (kwargs,) if args is None else args + tuple(index for _, index in kwargs)
+        super().__init__(node, deps)
+        self.builder = builder
+        self.args = args
+        self.kwargs = kwargs
+        self.strict_typing = constructor.strict_typing
+        self.typing_depth = constructor.typing_depth
+
+    def _arguments(self, values: list) -> Tuple[list, dict]:
+        if self.args is None:
+            return [values[self.kwargs]], {}
+        return [values[index] for index in self.args], {name: values[index] for name, index in self.kwargs}
+
+    def run(self, values: list) -> Any:
+        args, kwargs = self._arguments(values)
+        if self.args is None and isinstance(args[0], elements.Nothing):
+            if self.builder is None:
+                raise KeyError(self.node._name)
+            return self.builder()
+
+        if self.builder is None:
+            raise ConstructorError(
+                self.node, args, kwargs, f"Constructor for Tag '{self.node._name}' is not registered."
+            )
+
+        messages = nip.utils.check_typing(self.builder, args, kwargs, self.typing_depth)
+        if len(messages) > 0:
+            if self.strict_typing:
+                raise ConstructorError(self.node, args, kwargs, "\n".join(messages))
+            else:
+                elements._LOGGER.warning(
+                    f"Typing mismatch while constructing {self.node._name}:\n" + "\n".join(messages)
+                )
+
+        try:
+            return self.builder(*args, **kwargs)
+        except Exception as e:
+            raise ConstructorError(self.node, args, kwargs, e)
+
+    async def run_async(self, values: list, executor: Union[concurrent.futures.Executor, None], offload: bool) -> Any:
+        if offload and not inspect.iscoroutinefunction(self.builder):
+            result = await asyncio.get_running_loop().run_in_executor(executor, self.run, values)
+        else:
+            result = self.run(values)
+        if not asyncio.iscoroutine(result):
+            return result
+        try:
+            return await result
+        except Exception as e:
+            raise ConstructorError(self.node, *self._arguments(values), e)
+
+
+class _ClassStep(Step):
+    __slots__ = ("builder", "value")
+
+    def __init__(self, node: elements.Class, builder: Union[Callable, None], value: int):
+        super().__init__(node, (value,))
+        self.builder = builder
+        self.value = value
+
+    def run(self, values: list) -> Any:
+        assert isinstance(values[self.value], elements.Nothing), "Unexpected right value while constructing Class"
+        if self.builder is None:
+            raise KeyError(self.node._name)
+        return self.builder
+
+
+class _ArgsStep(Step):
+    __slots__ = ("args", "kwargs")
+
+    def __init__(self, node: elements.Args, args: Tuple[int, ...], kwargs: Tuple[Tuple[str, int], ...]):
+        super().__init__(node, args + tuple(index for _, index in kwargs))
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self, values: list) -> Any:
+        args = [values[index] for index in self.args]
+        kwargs = {name: values[index] for name, index in self.kwargs}
+        assert args or kwargs, "Error converting Args node to python"  # This should never happen
+        if args and kwargs:
+            return args, kwargs
+        return args or kwargs
+
+
+class _EvalStep(Step):
+    """Inline python or f-string evaluated with the links constructed before it as local variables"""
+
+    __slots__ = ("code", "links", "constructor")
+
+    def __init__(
+        self, node: elements.Node, code, links: Tuple[Tuple[str, int], ...], constructor: NonSequentialConstructor
+    ):
+        super().__init__(node, tuple(index for _, index in links))
+        self.code = code
+        self.links = links
+        self.constructor = constructor
+
+    def run(self, values: list) -> Any:
+        scope = {"self": self.node, "constructor": self.constructor}
+        scope.update((name, values[index]) for name, index in self.links)
+        return eval(self.code, vars(elements), scope)
+
+
+def _source(node: elements.Node) -> str:
+    return f"f{node._value}" if isinstance(node, elements.FString) else node._value
+
+
+def _preloaded_links(code: str, links: Dict[str, elements.LinkCreation]) -> List[str]:
+    """Links constructed before evaluating the code, as in `nip.non_seq_constructor.preload_vars`"""
+    table = symtable.symtable(code, "string", "exec")
+    names = []
+    for name in links:
+        try:
+            if table.lookup(name).is_global():
+                names.append(name)
+        except KeyError:
+            pass
+    return names
@@ -1,77 +1,161 @@
-from typing import Union, Type
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+from typing import Union, Type, List
 
 import nip.tokens as tokens
 
+_SPACES = re.compile(r"\s*")
+_TOP_LEVEL = re.compile(r"^[^\s#]", re.MULTILINE)  # line with a token at the very beginning
+
 
 class Stream:
-    def __init__(self, sstream: str):
-        self.lines = sstream.split("\n")
-        self.lines = [line + " " for line in self.lines]
+    """Token stream over the whole config kept as a single buffer.
+
+    Lines are addressed by offsets of their beginnings, so nothing is copied while scanning.
+    `n` and `pos` are the current line and the position in this line.
+
+    With `memoize=True` every token read is cached by its position and type,
+    so repeated peeks of the same token return the cached result.
+    """
+
+    def __init__(self, sstream: Union[str, bytes, mmap.mmap], memoize: bool = False):
+        if not isinstance(sstream, str):  # bytes or mmap of the file are decoded once
+            sstream = str(sstream, "utf-8")
+        self.buffer = sstream
+        self.line_starts = array("q", [0])
+        found = sstream.find("\n")
+        while found >= 0:
+            self.line_starts.append(found + 1)
+            found = sstream.find("\n", found + 1)
+
+        self.memoize = memoize
+        self.memo = {}  # (position, token type) -> (length, token) or TokenError. Only for the current line.
+        self.memo_hits = 0
+        self.memo_misses = 0
+
         self.n = 0
         self.pos = 0
         self.last_peak_pos = -1
+        self._set_line(0)
         self._pass_forward()
 
     def peek(self, *args: Union[tokens.Token, Type[tokens.Token]]):
         """Reads several tokens from stream"""
         if not self:
             return None
-        line = self.lines[self.n]
-        pos = self.pos
+        start = self._line_start
+        end = self._line_end
+        pos = start + self.pos
         self.last_peak_pos = -1  # prevent step() after failed peek()
         read_tokens = []
         for arg in args:
-            if isinstance(arg, tokens.Token):
-                token_type = arg.__class__
-            else:
+            expected = None
+            if isinstance(arg, type):  # cheaper than isinstance check against abstract Token
                 token_type = arg
+            else:
+                token_type = arg.__class__
+                expected = arg
 
             # skip empty line ending
-            while pos < len(line) and line[pos].isspace():
-                pos += 1
-            if pos >= len(line):
+            if pos < end:
+                pos = _SPACES.match(self.buffer, pos, end).end()
+            if pos >= end:  # also the case of token that ended on one of the next lines
                 return None
 
             try:
-                length, token = token_type.read(line[pos:])
+                if self.memoize:
+                    length, token = self._read_memoized(token_type, pos, end)
+                else:
+                    length, token = token_type.read_at(self.buffer, pos, end)
                 # mb: pass full stream to token. (This will allow multiline string parsing)
             except tokens.TokenError as e:
-                raise StreamError(self.n, pos, e)
+                raise StreamError(self.n, pos - start, e)
 
             if token is None:
                 return None
-            if isinstance(arg, tokens.Token) and token != arg:
+            if expected is not None and token != expected:
                 return None
 
-            token.set_position(self.n, pos)
+            token.set_position(self.n, pos - start)
             read_tokens.append(token)
             pos += length
 
-        self.last_peak_pos = pos
+        self.last_peak_pos = pos - start
         return read_tokens
 
+    def _read_memoized(self, token_type: Type[tokens.Token], pos: int, end: int):
+        key = (pos, token_type)
+        result = self.memo.get(key)
+        if result is None:
+            self.memo_misses += 1
+            try:
+                result = token_type.read_at(self.buffer, pos, end)
+            except tokens.TokenError as e:
+                result = e
+            self.memo[key] = result
+        else:
+            self.memo_hits += 1
+        if isinstance(result, tokens.TokenError):
+            raise result
+        return result
+
+    def lookahead(self) -> str:
+        """Returns the character at the current position or empty string at the end of the stream"""
+        if not self:
+            return ""
+        return self.buffer[self._line_start + self.pos]
+
+    def at_line_start(self) -> bool:
+        """Checks that there is only indent before the current position"""
+        start = self._line_start
+        return _SPACES.match(self.buffer, start, start + self.pos).end() == start + self.pos
+
+    def top_level_lines(self) -> List[int]:
+        """Numbers of the lines starting from the current one that have a token at the very beginning"""
+        if not self:
+            return []
+        matches = _TOP_LEVEL.finditer(self.buffer, self._line_start)
+        return [bisect_right(self.line_starts, match.start()) - 1 for match in matches]
+
+    def seek_line(self, n: int):
+        """Moves to the first token starting from the beginning of the line `n`"""
+        self.last_peak_pos = -1
+        self._set_line(n)
+        self._pass_forward()
+
     def step(self):
         assert self.last_peak_pos > 0, "step() called before peaking any Token"
         self.pos = self.last_peak_pos
+        if self._line_start + self.pos > self._line_end:  # multiline token
+            offset = self._line_start + self.pos
+            self._set_line(bisect_right(self.line_starts, offset) - 1)
+            self.pos = offset - self._line_start
         self._pass_forward()
 
-    def _pass_forward(self):
-        while self and (
-            self.pos >= len(self.lines[self.n])
-            or self.lines[self.n][self.pos :].isspace()
-            or self.lines[self.n][self.pos :].strip()[0] == "#"
-        ):
-            self.n += 1
-            self.pos = 0
-
-        if not self:
-            return
+    def _set_line(self, n: int):
+        self.n = n
+        self.pos = 0
+        if self.memo:
+            self.memo.clear()  # stream never returns to the previous lines
+        if n < len(self.line_starts):
+            self._line_start = self.line_starts[n]
+            if n + 1 < len(self.line_starts):
+                self._line_end = self.line_starts[n + 1] - 1
+            else:
+                self._line_end = len(self.buffer)
 
-        while self.lines[self.n][self.pos].isspace():
-            self.pos += 1
+    def _pass_forward(self):
+        while self:
+            pos = _SPACES.match(self.buffer, self._line_start + self.pos, self._line_end).end()
+            if pos < self._line_end and self.buffer[pos] != "#":
+                self.pos = pos - self._line_start
+                return
+            self._set_line(self.n + 1)
 
     def __bool__(self):
-        return self.n < len(self.lines)
+        return self.n < len(self.line_starts)
 
 
 class StreamError(Exception):
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import ast
+import re
 from abc import abstractmethod, ABC
 from typing import Tuple, Any, Union
 
@@ -15,6 +17,15 @@ class Token(ABC):
     def read(stream: str) -> Tuple[int, Union[None, Token]]:
         pass
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, Token]]:
+        """Reads token starting from `pos` of the line that ends at `end` in the `buffer`.
+
+        Same as `read` of the rest of the line followed by a space.
+        Token readers override it to scan the buffer in place without copying the line.
+        """
+        return cls.read(buffer[pos:end] + " ")
+
     def set_position(self, line, pos):
         self.line = line
         self.pos = pos
@@ -51,6 +62,18 @@ class Number(Token):
         else:
             return 0, None
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, Number]]:
+        if not buffer[pos].isdecimal() and buffer[pos] not in "+-.iInN":  # int() and float() accept nothing else
+            return 0, None
+        string = _read_until_comment(buffer, pos, end)
+        for t in (int, float):
+            try:
+                return len(string), Number(t(string))
+            except ValueError:
+                pass
+        return 0, None
+
     @staticmethod
     def _read_number_string(stream: str):
         string_number = ""
@@ -78,6 +101,17 @@ class Bool(Token):
             return len(string), Bool(False)
         return 0, None
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, Bool]]:
+        if buffer[pos] not in "tTyfFn":
+            return 0, None
+        string = _read_until_comment(buffer, pos, end)
+        if string in ["true", "True", "yes"]:
+            return len(string), Bool(True)
+        if string in ["false", "False", "no"]:
+            return len(string), Bool(False)
+        return 0, None
+
 
 # class NoneType(Token):
 #     @staticmethod
@@ -112,6 +146,24 @@ class String(Token):
             return 0, None
         return pos, String(stream[:pos].strip())
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, String]]:
+        if Operator.pattern.match(buffer, pos, end):
+            return 0, None
+        start_char = buffer[pos]
+        if start_char in "'\"":
+            close = buffer.find(start_char, pos + 1, end)
+            if close < 0:
+                raise TokenError("Not closed string expression")
+            return close + 1 - pos, String(buffer[pos + 1 : close])
+
+        close = buffer.find("#", pos, end)
+        if close < 0:
+            close = end
+        if close == pos:
+            return 0, None
+        return close - pos, String(buffer[pos:close].strip())
+
 
 class Name(String):
     @staticmethod
@@ -125,9 +177,20 @@ class Name(String):
 
         return pos, Name(stream[:pos])
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, Name]]:
+        if not buffer[pos].isalpha():
+            return 0, None
+        close = _NAME_TAIL.match(buffer, pos + 1, end).end()
+        return close - pos, Name(buffer[pos:close])
+
 
 class Operator(Token):
     operators = ["---", "@", "#", "&", "!&", "!!", "!", "- ", ": ", "*", "{", "}", "[", "]", "(", ")"]
+    # alternation keeps `operators` priority, trailing space of an operator also matches the line end
+    pattern = re.compile(
+        "|".join(f"({re.escape(op.rstrip())}{'(?: |$)' if op.endswith(' ') else ''})" for op in operators)
+    )
 
     @staticmethod
     def read(stream: str) -> Tuple[int, Union[None, Operator]]:
@@ -136,6 +199,13 @@ class Operator(Token):
                 return len(op), Operator(op)
         return 0, None
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, Operator]]:
+        match = cls.pattern.match(buffer, pos, end)
+        if match is None:
+            return 0, None
+        return match.end() - pos, Operator(cls.operators[match.lastindex - 1])
+
 
 class Indent(Token):
     @staticmethod
@@ -168,6 +238,13 @@ class List(Token):
         read_list = eval(stream[:pos])
         return pos, List(read_list)
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, List]]:
+        if buffer[pos] != "[":
+            return 0, None
+        length, value = _read_collection(buffer, pos, end, "List")
+        return length, List(value)
+
 
 class TupleToken(Token):
     @staticmethod
@@ -183,6 +260,13 @@ class TupleToken(Token):
         read_list = eval(stream[:pos])
         return pos, List(read_list)
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, List]]:
+        if buffer[pos] != "(":
+            return 0, None
+        length, value = _read_collection(buffer, pos, end, "Tuple")
+        return length, List(value)
+
 
 class Dict(Token):
     @staticmethod
@@ -198,6 +282,13 @@ class Dict(Token):
         read_dict = eval(stream[:pos])
         return pos, Dict(read_dict)
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, Dict]]:
+        if buffer[pos] != "{":
+            return 0, None
+        length, value = _read_collection(buffer, pos, end, "Dict")
+        return length, Dict(value)
+
 
 class InlinePython(Token):
     @staticmethod
@@ -213,6 +304,15 @@ class InlinePython(Token):
         pos += 1
         return pos, InlinePython(stream[1 : pos - 1])
 
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, InlinePython]]:
+        if buffer[pos] != "`":
+            return 0, None
+        close = buffer.find("`", pos + 1, end)
+        if close < 0:
+            raise TokenError("Inline python string was not clothed")
+        return close + 1 - pos, InlinePython(buffer[pos + 1 : close])
+
 
 class PythonString(Token):
     @classmethod
@@ -231,3 +331,145 @@ class PythonString(Token):
                 raise TokenError("Not closed r-string")
             return len(string), PythonString((string[1:], "r"))
         return 0, None
+
+    @classmethod
+    def read_at(cls, buffer: str, pos: int, end: int) -> Tuple[int, Union[None, PythonString]]:
+        if buffer[pos] not in "fr":
+            return 0, None
+        return cls.read(buffer[pos:end])
+
+
+_NAME_TAIL = re.compile(r"[\w.]*")
+
+
+def _read_until_comment(buffer: str, pos: int, end: int) -> str:
+    close = buffer.find(" #", pos, end)
+    if close < 0:
+        close = end
+    return buffer[pos:close].strip()
+
+
+def _read_collection(buffer: str, pos: int, end: int, name: str) -> Tuple[int, Any]:
+    """Reads inline list, tuple or dict starting at `pos`.
+
+    Literals are read by `LiteralReader` and may span several lines.
+    Anything else is evaluated as python code up to the first closing bracket of the line.
+    """
+    try:
+        reader = LiteralReader(buffer, pos)
+        return reader.read() - pos, reader.value
+    except NotLiteralError:
+        pass
+    close = buffer.find(_CLOSING_BRACKETS[buffer[pos]], pos, end)
+    if close < 0:
+        raise TokenError(f"{name} was not closed")
+    return close + 1 - pos, eval(buffer[pos : close + 1])
+
+
+_CLOSING_BRACKETS = {"[": "]", "(": ")", "{": "}"}
+_LITERAL_CONSTANTS = {"True": True, "False": False, "None": None}
+_INT = r"[+-]?\d[\d_]*(?![\w.])"
+_FLOAT = r"[+-]?(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?(?![\w.])"
+_LITERAL_TOKEN = re.compile(
+    rf"\s*(?:(?P<int>{_INT})|(?P<float>{_FLOAT})"
+    r"|(?P<string>\"(?:[^\"\\\n]|\\.)*\"|'(?:[^'\\\n]|\\.)*')"
+    r"|(?P<constant>True|False|None)(?!\w)"
+    r"|(?P<punctuation>[\[\](){},:]))"
+)
+_NUMBERS = re.compile(rf"(?P<int>{_INT})|(?P<float>{_FLOAT})")
+_FLAT_NUMBERS = re.compile(rf"\[\s*(?:(?:{_FLOAT})\s*,\s*)*(?:(?:{_FLOAT})\s*)?\]")  # the most common case
+_LITERAL_SPACES = re.compile(r"\s*")
+
+
+class NotLiteralError(Exception):
+    pass
+
+
+class LiteralReader:
+    """Reads python literal of nested lists, tuples and dicts of numbers, strings, bools and None.
+
+    Collections may span several lines and contain `#` comments. `NotLiteralError` is raised for anything else.
+    """
+
+    def __init__(self, buffer: str, pos: int):
+        self.buffer = buffer
+        self.pos = pos
+        self.value = None
+
+    def read(self) -> int:
+        """Reads the literal and returns position right after it"""
+        flat = _FLAT_NUMBERS.match(self.buffer, self.pos)
+        if flat is not None:
+            try:
+                self.value = [int(i) if i else float(f) for i, f in _NUMBERS.findall(flat.group())]
+            except ValueError:
+                raise NotLiteralError()
+            self.pos = flat.end()
+            return self.pos
+
+        self.value = self._read_value(self._next())
+        return self.pos
+
+    def _next(self) -> re.Match:
+        match = _LITERAL_TOKEN.match(self.buffer, self.pos)
+        while match is None:  # comments are rare, so they are not a part of the pattern
+            self.pos = _LITERAL_SPACES.match(self.buffer, self.pos).end()
+            if not self.buffer.startswith("#", self.pos):
+                raise NotLiteralError()
+            self.pos = self.buffer.find("\n", self.pos)
+            if self.pos < 0:
+                self.pos = len(self.buffer)
+            match = _LITERAL_TOKEN.match(self.buffer, self.pos)
+        self.pos = match.end()
+        return match
+
+    def _read_value(self, match: re.Match) -> Any:
+        kind = match.lastgroup
+        text = match.group(kind)
+        try:
+            if kind == "int":
+                return int(text)
+            if kind == "float":
+                return float(text)
+        except ValueError:
+            raise NotLiteralError()
+        if kind == "string":
+            if "\\" in text:
+                return ast.literal_eval(text)
+            return text[1:-1]
+        if kind == "constant":
+            return _LITERAL_CONSTANTS[text]
+        if text in _CLOSING_BRACKETS:
+            return self._read_collection(text)
+        raise NotLiteralError()
+
+    def _read_collection(self, opening: str) -> Any:
+        closing = _CLOSING_BRACKETS[opening]
+        items = []
+        separated = False
+        match = self._next()
+        while match.group("punctuation") != closing:
+            item = self._read_value(match)
+            if opening == "{":
+                if self._next().group("punctuation") != ":":
+                    raise NotLiteralError()
+                item = (item, self._read_value(self._next()))
+            items.append(item)
+
+            match = self._next()
+            if match.group("punctuation") == ",":
+                separated = True
+                match = self._next()
+            elif match.group("punctuation") != closing:
+                raise NotLiteralError()
+
+        if opening == "[":
+            return items
+        if opening == "{":
+            try:
+                return dict(items)
+            except TypeError:  # unhashable key
+                raise NotLiteralError()
+        if len(items) == 1 and not separated:
+            return items[0]  # just parentheses
+        return tuple(items)
@@ -1,4 +1,7 @@
+import functools
 import inspect
+import types
+import typing
 from typing import List, Dict, Union, Any
 
 import typeguard
@@ -42,43 +45,112 @@ def iterate_items(obj):
 
 
 def flatten(obj, delimiter=".", keys=()):
-    if not isinstance(obj, (list, tuple, dict)):
-        return {delimiter.join(keys): obj}
-
     result = {}
-    for key, value in iterate_items(obj):
-        result.update(flatten(value, delimiter, keys=keys + (str(key),)))
+    stack = [(delimiter.join(map(str, keys)) if keys else None, obj)]  # path is None for the object itself
+    while stack:
+        path, obj = stack.pop()
+        if not isinstance(obj, (list, tuple, dict)):
+            result["" if path is None else path] = obj
+            continue
+        items = [(str(key) if path is None else f"{path}{delimiter}{key}", value) for key, value in iterate_items(obj)]
+        stack.extend(reversed(items))
     return result
 
 
-def check_typing(func, args, kwargs) -> List[str]:
-    try:
-        signature = inspect.signature(func)
-    except ValueError:  # unable to load function signature (common case for builtin functions)
+TYPING_DEPTHS = ("off", "shallow", "sampled", "full")
+_TYPING_CHECKERS_SIZE = 1024  # (builder, depth) pairs with prepared checkers of their arguments
+
+
+def check_typing(func, args, kwargs, depth: str = "full") -> List[str]:
+    """Messages about the arguments that don't match the annotations of the builder.
+
+    `depth` is one of `TYPING_DEPTHS`: "shallow" checks only the types of the containers and not their items,
+    "sampled" checks the first item of each container and "full" checks all of them.
+    """
+    if depth == "off":
         return []
+    checkers = _get_checkers(func, depth)
+    if checkers is None:  # unable to load function signature (common case for builtin functions)
+        return []
+    positional, named = checkers
     messages = []
-    typeguard.typechecked()
-    if len(args) > len(signature.parameters.values()):
+    if len(args) > len(positional):
         messages.append("Too many arguments")
-    for arg, param in zip(args, signature.parameters.values()):
-        print(arg, param)
-        if param.annotation is inspect.Parameter.empty:
-            continue
-        try:
-            typeguard.check_type(arg, param.annotation)
-        except typeguard.TypeCheckError as e:
-            messages.append(f"{param.name}: {e}")
+    for arg, (name, checker) in zip(args, positional):
+        if checker is not None:
+            message = checker(arg)
+            if message is not None:
+                messages.append(f"{name}: {message}")
 
     for name, value in kwargs.items():
-        if name not in signature.parameters:
-            continue  # handled by python
-        annotation = signature.parameters[name].annotation
-        # print(name, annotation, value)
-        if annotation is inspect.Parameter.empty:
-            continue
-        try:
-            typeguard.check_type(value, annotation)
-        except typeguard.TypeCheckError as e:
-            messages.append(f"{name}: {e}")
+        checker = named.get(name)  # unknown names are handled by python
+        if checker is not None:
+            message = checker(value)
+            if message is not None:
+                messages.append(f"{name}: {message}")
 
     return messages
+
+
+def _get_checkers(func, depth: str):
+    """Checkers of positional arguments with their names and of named ones. Prepared once per builder."""
+    try:
+        return _cached_checkers(func, depth)
+    except TypeError:  # not hashable builder
+        return _prepare_checkers(func, depth)
+
+
+@functools.lru_cache(maxsize=_TYPING_CHECKERS_SIZE)  # least recently used builders are dropped with their annotations
+def _cached_checkers(func, depth: str):
+    return _prepare_checkers(func, depth)
+
+
+def _prepare_checkers(func, depth: str):
+    if depth not in TYPING_DEPTHS:
+        raise ValueError(f"Unknown typing depth '{depth}', expected one of {TYPING_DEPTHS}")
+    try:
+        signature = inspect.signature(func)
+    except ValueError:
+        return None
+    positional, named = [], {}
+    for param in signature.parameters.values():
+        checker = None
+        if param.annotation is not inspect.Parameter.empty and param.annotation is not Any:
+            checker = _make_checker(param.annotation, depth)
+        positional.append((param.name, checker))
+        named[param.name] = checker
+    return positional, named
+
+
+def _make_checker(annotation, depth: str):
+    if depth == "shallow":
+        annotation = _shallow_annotation(annotation)
+    strategy = typeguard.CollectionCheckStrategy.ALL_ITEMS
+    if depth == "sampled":
+        strategy = typeguard.CollectionCheckStrategy.FIRST_ITEM
+    fast_class = None  # instances of the class are accepted without typeguard
+    if isinstance(annotation, type) and not getattr(annotation, "_is_protocol", False):
+        fast_class = annotation
+
+    def checker(value):
+        if fast_class is not None and isinstance(value, fast_class):
+            return None
+        try:
+            typeguard.check_type(value, annotation, collection_check_strategy=strategy)
+        except typeguard.TypeCheckError as e:
+            return str(e)
+        return None
+
+    return checker
+
+
+def _shallow_annotation(annotation):
+    """Annotation without the types of container items: `List[int]` -> `list`, `Optional[Dict[str, int]]` -> `dict`"""
+    if hasattr(annotation, "__metadata__"):  # Annotated[...]
+        return _shallow_annotation(annotation.__origin__)
+    origin = getattr(annotation, "__origin__", None)
+    if origin is typing.Union or annotation.__class__ is getattr(types, "UnionType", None):  # `int | str` as well
+        return typing.Union[tuple(map(_shallow_annotation, annotation.__args__))]
+    if origin is None or origin is getattr(typing, "Literal", None):
+        return annotation
+    return origin
@@ -0,0 +1,216 @@
+# Hot reload of edited configs
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Union, Callable, List, Optional
+
+from . import elements
+from .parser import Parser, ParserError
+from .stream import Stream, StreamError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Watcher:
+    """Polls config file and reparses only its changed top-level sections.
+
+    `callback(tree, changed_paths)` is called with the new Document and dotted paths of the changed nodes.
+    Nodes of unchanged sections are moved to the new tree as they are, so objects built from them are still valid.
+    Files inserted with `!!insert` are watched as well. Iterators of the config are not expanded.
+
+    Parameters
+    ----------
+    path: str or Path
+        Path to config file.
+    callback: Callable
+        Called as `callback(tree, changed_paths)` after every edit that changed the config.
+    interval: float
+        Seconds between checks of the files.
+    debounce: float
+        File is reparsed only after it stays unchanged for this number of seconds.
+        This skips partially written files and series of quick saves.
+    implicit_fstrings: bool
+        If True, all quoted strings will be treated as python f-strings.
+    strict: bool
+        It True, checks overwriting dict keys and positioning (`args` before `kwargs`).
+    on_error: Callable, optional
+        Called with the exception if the edited config can't be parsed. By default, it is logged.
+        Previous tree is kept in this case.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        callback: Callable[[elements.Document, List[str]], None],
+        interval: float = 1.0,
+        debounce: float = 0.5,
+        implicit_fstrings: bool = True,
+        strict: bool = False,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.path = Path(path)
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self.implicit_fstrings = implicit_fstrings
+        self.strict = strict
+        self.on_error = on_error
+        self.tree = None
+        self._sections = None  # key -> (lines of the section, node, inserted files). None if not a top-level dict
+        self._dependencies = []
+        self._pending = None  # state of the files seen while debouncing and the time it was first seen
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._reload(set())
+        self._state = self._files_state()
+
+    def check(self) -> bool:
+        """Checks the files once and reparses the config if it was changed. Returns True if it was reparsed."""
+        state = self._files_state()
+        if state == self._state:
+            self._pending = None
+            return False
+        now = time.monotonic()
+        if self._pending is None or self._pending[0] != state:
+            self._pending = state, now
+        if now - self._pending[1] < self.debounce:
+            return False
+        self._pending = None
+
+        changed_files = {file[0] for file in state if file not in self._state}
+        old_tree, old_dependencies = self.tree, self._dependencies
+        self._state = state  # broken config is not reparsed until the next edit
+        try:
+            self._reload(changed_files)
+        except (OSError, ParserError, StreamError) as e:
+            if self.on_error is None:
+                _LOGGER.warning(f"Unable to reload '{self.path}': {e}")
+            else:
+                self.on_error(e)
+            return False
+        if self._dependencies != old_dependencies:
+            self._state = self._files_state()
+
+        changed_paths = diff(old_tree, self.tree)
+        if changed_paths:
+            self.callback(self.tree, changed_paths)
+        return True
+
+    def start(self) -> "Watcher":
+        """Starts checking the files in a background thread"""
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name=f"nip-watch-{self.path.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                _LOGGER.exception(f"Error while reloading '{self.path}'")
+
+    def _files_state(self) -> tuple:
+        state = []
+        for path in [self.path] + self._dependencies:
+            try:
+                stat = path.stat()
+                state.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                state.append((str(path), None, None))
+        return tuple(state)
+
+    def _reload(self, changed_files: set):
+        text = self.path.read_text()
+        parser = Parser(implicit_fstrings=self.implicit_fstrings, strict=self.strict)
+        parser.path = self.path.resolve()
+        stream = Stream(text)
+        doc_name = elements.Document._read_name(stream)
+        sections = elements.read_sections(stream, parser)
+        if sections is None:
+            tree = parser.parse_string(text)
+            new_sections = None
+            dependencies = parser.dependencies
+        else:
+            kwargs, new_sections, dependencies = {}, {}, []
+            for key, line, source in sections:
+                old = self._sections.get(key) if self._sections is not None else None
+                if old is not None and old[0] == source and not changed_files.intersection(map(str, old[2])):
+                    node, inserted = old[1], old[2]
+                else:
+                    parser.dependencies = []
+                    node = elements.read_section(source, line, parser)
+                    inserted = parser.dependencies
+                kwargs[key] = node
+                new_sections[key] = source, node, inserted
+                dependencies += [path for path in inserted if path not in dependencies]
+            tree = elements.Document(doc_name, elements.Args("args", ([], kwargs)))
+            tree._update_parents()
+        tree._path = self.path
+        self.tree, self._sections, self._dependencies = tree, new_sections, dependencies
+
+
+def watch(
+    path: Union[str, Path],
+    callback: Callable[[elements.Document, List[str]], None],
+    interval: float = 1.0,
+    debounce: float = 0.5,
+    implicit_fstrings: bool = True,
+    strict: bool = False,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> Watcher:
+    """Starts watching the config in a background thread. Parsed config is available as `watcher.tree`.
+
+    See `Watcher` for the parameters. Call `stop()` of the returned watcher to stop watching.
+    """
+    return Watcher(path, callback, interval, debounce, implicit_fstrings, strict, on_error).start()
+
+
+def diff(old: elements.Node, new: elements.Node, path: str = "") -> List[str]:
+    """Dotted paths of the nodes that differ in two trees. Positional items are addressed by their index.
+
+    Trees are compared without recursion, so deep configs are fine as well.
+    """
+    changed = []
+    stack = [(old, new, path)]  # None instead of a node that is in one of the trees only
+    while stack:
+        old, new, path = stack.pop()
+        if old is new:
+            continue
+        if old is None or new is None:
+            changed.append(path)
+        elif isinstance(old, elements.Args) and isinstance(new, elements.Args):
+            (old_args, old_kwargs), (new_args, new_kwargs) = old._value, new._value
+            pairs = [
+                (
+                    old_args[i] if i < len(old_args) else None,
+                    new_args[i] if i < len(new_args) else None,
+                    elements.join_path(path, i),
+                )
+                for i in range(max(len(old_args), len(new_args)))
+            ]
+            for key in list(old_kwargs) + [key for key in new_kwargs if key not in old_kwargs]:
+                pairs.append((old_kwargs.get(key), new_kwargs.get(key), elements.join_path(path, key)))
+            stack.extend(reversed(pairs))  # paths are listed in the order of the items
+        elif type(old) is type(new) and old._name == new._name:
+            if isinstance(old._value, elements.Node) and isinstance(new._value, elements.Node):
+                stack.append((old._value, new._value, path))
+            elif old._value != new._value:
+                changed.append(path)
+        else:
+            changed.append(path)
+    return changed
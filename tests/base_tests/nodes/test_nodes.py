@@ -0,0 +1,49 @@
+import copy
+import gc
+import pickle
+import weakref
+
+import pytest
+
+import nip
+
+CONFIG = "main: !tag\n  items:\n    - 1\n    - [2, 3]\n  name: value\nother: 5\n"
+
+
+def test_no_dict_and_weak_parents():
+    tree = nip.parse_string(CONFIG, weak_parents=True)
+    main = tree["main"]
+    assert not hasattr(main, "__dict__")
+    assert main._parent._parent is tree
+    assert tree.main.items[1].to_python() == [2, 3]  # attribute access without the copies of Args keys
+
+    ref = weakref.ref(tree)
+    gc.disable()
+    try:
+        del tree, main
+        assert ref() is None  # freed by reference counting
+    finally:
+        gc.enable()
+
+
+def test_copies():
+    for weak_parents in (False, True):
+        tree = nip.parse_string(CONFIG, weak_parents=weak_parents)
+        for other in (pickle.loads(pickle.dumps(tree)), copy.deepcopy(tree)):
+            assert other.to_python() == tree.to_python()
+            assert other["main"]["items"]._get_root() is other
+            assert isinstance(other["main"]._parent_ref, weakref.ref) == weak_parents
+
+
+def test_parts_of_dropped_tree():
+    config = "dim: &dim 4\nmodel:\n  size: *dim\n"
+    model = nip.parse_string(config)["model"]
+    assert nip.construct(model) == {"size": 4}  # the tree is kept by its part
+
+    model = nip.parse_string(config, weak_parents=True)["model"]
+    with pytest.raises(ReferenceError):
+        nip.construct(model)
+    with pytest.raises(ReferenceError):
+        model.update()
+    with pytest.raises(nip.dumper.DumpError):
+        nip.elements.Value("int", 1).update()
@@ -0,0 +1,32 @@
+from nip.parser import Parser
+
+
+def test_backtracks():
+    parser = Parser()
+    config = parser.parse_string(
+        "obj: !SimpleClass\n  name: &name Hello\n  items:\n    - !&SimpleClass\n    - *name\n    - 5\n"
+    )
+    assert config["obj"]["items"][2].to_python() == 5
+    # `Hello`: Args and Nothing, `!&SimpleClass` right value: Args, `5`: Nothing
+    assert parser.backtracks == 4
+
+
+def test_backtracks_are_per_parse():
+    parser = Parser()
+    parser.parse_string("value: 1")
+    assert parser.backtracks == 1
+    parser.parse_string("value: 1")
+    assert parser.backtracks == 1
+    assert Parser().backtracks == 0
+
+
+def test_memoized_tokens():
+    with open("base_tests/tags/configs/simple_tag_config.nip") as f:
+        string = f.read()
+    parser = Parser(memoize_tokens=True)
+    assert parser.parse_string(string) == Parser().parse_string(string)
+    assert parser.memo_hits > 0 and 0 < parser.memo_hit_rate < 1
+    hits, misses = parser.memo_hits, parser.memo_misses
+    parser.parse_string(string)
+    assert (parser.memo_hits, parser.memo_misses) == (hits, misses)
+    assert Parser().memo_hit_rate == 0
@@ -0,0 +1,28 @@
+import mmap
+
+import nip.elements
+import nip.tokens as tokens
+from nip.parser import Parser
+from nip.stream import Stream
+
+CONFIG_PATH = "base_tests/tags/configs/simple_tag_config.nip"
+
+
+def _read(stream):
+    return nip.elements.Document.read(stream, Parser())
+
+
+def test_stream_positions():
+    stream = Stream("a:\n  # comment\n\n    b: 1")
+    assert (stream.n, stream.pos) == (0, 0)
+    assert stream.peek(tokens.Name, tokens.Operator(": ")) is not None  # line end acts as a space
+    stream.step()
+    assert (stream.n, stream.pos) == (3, 4)
+    assert stream.at_line_start() and stream.lookahead() == "b"
+
+
+def test_mmap_stream():
+    with open(CONFIG_PATH) as f:
+        expected = _read(Stream(f.read()))
+    with open(CONFIG_PATH, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert _read(Stream(mapped)) == expected
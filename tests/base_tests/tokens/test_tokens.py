@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+import nip.tokens as tokens
+
+TOKEN_TYPES = [
+    tokens.Number,
+    tokens.Bool,
+    tokens.String,
+    tokens.Name,
+    tokens.Operator,
+    tokens.InlinePython,
+    tokens.PythonString,
+]
+
+
+def _read(read_function, max_length):
+    try:
+        length, token = read_function()
+    except IndexError:  # `read` runs past the line end on not closed quotes and brackets
+        return tokens.TokenError
+    except Exception as e:
+        return type(e)
+    if token is None:
+        return length, None
+    return min(length, max_length), type(token), token._value  # `read` may also consume the padding space
+
+
+@pytest.mark.parametrize("token_type", TOKEN_TYPES, ids=lambda t: t.__name__)
+def test_read_at_matches_read(token_type):
+    lines = []
+    for path in Path(".").rglob("*.nip"):
+        lines += path.read_text().split("\n")
+    assert lines
+
+    for line in lines:
+        for pos in range(len(line)):
+            if line[pos].isspace():
+                continue
+            max_length = len(line) - pos
+            expected = _read(lambda: token_type.read(line[pos:] + " "), max_length)
+            assert _read(lambda: token_type.read_at(line, pos, len(line)), max_length) == expected, (line, pos)
+
+
+def test_not_closed():
+    with pytest.raises(tokens.TokenError, match="Not closed string"):
+        tokens.String.read_at('key: "not closed', 5, 16)
+    with pytest.raises(tokens.TokenError, match="List was not closed"):
+        tokens.List.read_at("key: [1, 2\n3]", 5, 10)
+
+
+@pytest.mark.parametrize(
+    "string",
+    [
+        "[1, -2, 3.5, 1e-3, .5, 1_000, True, None]",
+        "[[1, 2], [3, [4, 'a]']]]",
+        "('a', \"b\\n\", (1,), (2), ())",
+        "{'a': {'b': [1, {}]}, 2: (None, False),}",
+        "[1 + 2, 3]",
+        "{1, 2}",
+    ],
+)
+def test_inline_collections(string):
+    token_type = {"[": tokens.List, "(": tokens.TupleToken, "{": tokens.Dict}[string[0]]
+    length, token = token_type.read_at(string, 0, len(string))
+    assert length == len(string)
+    assert token._value == eval(string) and type(token._value) is type(eval(string))
+
+
+def test_multiline_collection():
+    from nip import parse_string
+
+    config = parse_string("a: [1, [2, 3],  # comment\n    4]\nb: {'x': (1,\n  2)}\nc: 5")
+    assert config.to_python() == {"a": [1, [2, 3], 4], "b": {"x": (1, 2)}, "c": 5}
@@ -0,0 +1,54 @@
+import nip
+from nip.elements import Args, Tag, Value, walk, fold
+from nip.non_seq_constructor import NonSequentialConstructor
+from nip.utils import flatten
+
+CONFIG = "main: !tag\n  items:\n    - 1\n    - [2, 3]\n  name: value\nother: 5\n"
+DEPTH = 10000
+
+
+def deep_tree(depth: int):
+    node = Value("int", 0)
+    for _ in range(depth):
+        node = Args("args", ([], {"key": node}))
+    return node
+
+
+def test_walk():
+    tree = nip.parse_string(CONFIG)
+    values = [(path, node) for path, node in walk(tree, with_paths=True) if isinstance(node, Value)]
+    assert [path for path, _ in values] == ["main.items.0", "main.items.1", "main.name", "other"]
+    for path, node in values:
+        assert tree[path] is node
+
+    nodes = list(walk(tree))
+    assert nodes[0] is tree
+    assert set(map(id, walk(tree, post_order=True))) == set(map(id, nodes))
+    post_order = list(walk(tree["main"], post_order=True))
+    assert post_order[-1] is tree["main"]
+    assert isinstance(post_order[-2], Args)
+
+
+def test_fold():
+    tree = nip.parse_string(CONFIG)
+    count = fold(tree, lambda node: [child for _, child in node._children()], lambda node, values: 1 + sum(values))
+    assert count == len(list(walk(tree)))
+
+
+def test_deep_tree():
+    tree = deep_tree(DEPTH)
+    assert len(list(walk(tree))) == DEPTH + 1
+    assert len(list(walk(tree, post_order=True, with_paths=True))) == DEPTH + 1
+    tree._update_parents()
+    *_, leaf = walk(tree)
+    assert leaf._get_root() is tree
+
+    python = tree.to_python()
+    for _ in range(DEPTH):
+        python = python["key"]
+    assert python == 0
+
+    assert nip.dump_string(Tag("tag", tree)).count("key:") == DEPTH
+    assert len(flatten(tree.to_python())) == 1
+    assert tree.fingerprint() == deep_tree(DEPTH).fingerprint()
+    NonSequentialConstructor(tree)
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import nip
+from nip.constructor import ConstructorError
+
+calls = []
+
+
+@nip.nip("async_load")
+async def async_load(name: str, delay: float = 0.2, fail: bool = False, source=None):
+    calls.append(name)
+    await asyncio.sleep(delay)
+    if fail:
+        raise ValueError(f"{name} failed")
+    return {"name": name, "source": source}
+
+
+@nip.nip("blocking_load")
+def blocking_load(name: str, delay: float = 0.2):
+    time.sleep(delay)
+    return {"name": name, "thread": threading.get_ident()}
+
+
+CONFIG = """
+index: &index !async_load
+  name: index
+reader: !async_load
+  name: reader
+  source: *index
+tokenizer: !async_load
+  name: tokenizer
+  source: *index
+dataset: !async_load
+  name: dataset
+size: 5
+"""
+
+
+def test_async_construction():
+    config = nip.parse_string(CONFIG)
+    calls.clear()
+    start = time.perf_counter()
+    result = asyncio.run(nip.construct_async(config))
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.6  # index and dataset, then reader and tokenizer
+    assert sorted(calls) == ["dataset", "index", "reader", "tokenizer"]
+    assert result["reader"]["source"] is result["tokenizer"]["source"]
+    assert result["reader"]["source"] == {"name": "index", "source": None}
+    assert result["size"] == 5
+
+
+def test_offload():
+    config = nip.parse_string("- !blocking_load\n  name: a\n- !blocking_load\n  name: b\n- !blocking_load\n  name: c\n")
+
+    async def construct(offload: bool):
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        result = await nip.construct_async(config, offload=offload)
+        ticker.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(construct(offload=True))
+    assert [item["name"] for item in result] == ["a", "b", "c"]
+    assert threading.get_ident() not in {item["thread"] for item in result}
+    assert ticks > 5  # the loop kept running
+    result, ticks = asyncio.run(construct(offload=False))
+    assert {item["thread"] for item in result} == {threading.get_ident()}
+    assert ticks < 3  # blocked while the builders ran
+
+
+def test_first_error():
+    config = nip.parse_string(
+        "first: !async_load\n  name: first\n  delay: 0.1\n  fail: true\n"
+        "second: !async_load\n  name: second\n  delay: 0\n  fail: true\n"
+    )
+    with pytest.raises(ConstructorError, match="first failed"):
+        asyncio.run(nip.construct_async(config))
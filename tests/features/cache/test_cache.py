@@ -0,0 +1,142 @@
+import os
+
+import nip
+from nip import ParseCache, Parser
+from nip.elements import Lazy
+from nip.iter_parser import IterParser
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cache_hits_and_copies(tmp_path):
+    path = tmp_path / "config.nip"
+    _write(path, "main:\n  value: 1\n", 10**18)
+    cache = ParseCache()
+
+    first = cache.parse(Parser(), path)
+    first["main"]["value"] = 2
+    second = cache.parse(Parser(), path)
+    assert second.to_python() == {"main": {"value": 1}}
+    assert cache.info() == (1, 1, 128, 1)
+
+    _write(path, "main:\n  value: 3\n", 2 * 10**18)
+    assert cache.parse(Parser(), path).to_python() == {"main": {"value": 3}}
+    assert cache.info().misses == 2
+
+    cache.invalidate(path)
+    assert cache.info().currsize == 0
+
+
+def test_hash_check(tmp_path):
+    path = tmp_path / "config.nip"
+    _write(path, "value: 1", 10**18)
+    cache = ParseCache(check_hash=True)
+    cache.parse(Parser(), path)
+    _write(path, "value: 2", 10**18)  # same size and mtime
+    assert cache.parse(Parser(), path).to_python() == {"value": 2}
+    assert cache.info().hits == 0
+
+
+def test_inserted_files(tmp_path):
+    inserted = tmp_path / "inserted.nip"
+    _write(inserted, "size: 1", 10**18)
+    path = tmp_path / "config.nip"
+    _write(path, f'block: !!insert "{inserted}"', 10**18)
+    cache = ParseCache()
+    cache.parse(Parser(), path)
+    parser = Parser()
+    assert cache.parse(parser, path).to_python() == {"block": {"size": 1}}
+    assert parser.dependencies == [inserted.resolve()]
+
+    _write(inserted, "size: 2", 2 * 10**18)
+    assert cache.parse(Parser(), path).to_python() == {"block": {"size": 2}}
+    assert cache.info()[:2] == (1, 2)
+
+
+def test_hash_of_inserted_files(tmp_path, monkeypatch):
+    inserted = tmp_path / "inserted.nip"
+    _write(inserted, "size: 1", 10**18)
+    path = tmp_path / "config.nip"
+    _write(path, f'block: !!insert "{inserted}"', 10**18)
+
+    def no_hash(*args):
+        raise AssertionError("content is hashed without check_hash")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(nip.cache.hashlib, "sha256", no_hash)
+        cache = ParseCache()
+        cache.parse(Parser(), path)
+        _write(inserted, "size: 1", 2 * 10**18)  # touched, so only mtime is changed
+        assert cache.parse(Parser(), path).to_python() == {"block": {"size": 1}}
+        assert cache.info()[:2] == (0, 2)
+
+    cache = ParseCache(check_hash=True)
+    cache.parse(Parser(), path)
+    _write(inserted, "size: 1", 3 * 10**18)
+    cache.parse(Parser(), path)
+    assert cache.info()[:2] == (1, 1)
+
+
+def test_lazy_and_eager_trees(tmp_path):
+    path = tmp_path / "config.nip"
+    _write(path, "main:\n  value: 1\n", 10**18)
+    for kwargs in [{"cache": True}, {"disk_cache": tmp_path / "cache"}]:
+        assert isinstance(nip.parse(path, lazy=True, **kwargs)._value["main"], Lazy)
+        assert not isinstance(nip.parse(path, **kwargs)._value["main"], Lazy)
+
+
+def test_lru(tmp_path):
+    cache = ParseCache(maxsize=2)
+    for i in range(3):
+        _write(tmp_path / f"{i}.nip", f"value: {i}", 10**18)
+        cache.parse(Parser(), tmp_path / f"{i}.nip")
+    assert cache.info().currsize == 2
+    cache.parse(Parser(), tmp_path / "0.nip")
+    assert cache.info().misses == 4
+
+
+def test_cached_iterators():
+    nip.parse_cache.invalidate()
+    path = "features/flatten/configs/complex.nip"
+    expected = [config.to_python() for config in nip.parse(path)]
+    assert [config.to_python() for config in nip.parse(path, cache=True)] == expected
+    assert [config.to_python() for config in nip.parse(path, cache=True)] == expected
+    assert nip.parse_cache.info().hits == 1
+
+
+def test_disk_cache(tmp_path):
+    inserted = tmp_path / "inserted.nip"
+    _write(inserted, "value: 1", 10**18)
+    path = tmp_path / "config.nip"
+    _write(path, f'main: !!insert "{inserted}"\nother: @ [1, 2]', 10**18)
+
+    assert [config.to_python() for config in nip.parse(path, disk_cache=True)] == [
+        {"main": {"value": 1}, "other": 1},
+        {"main": {"value": 1}, "other": 2},
+    ]
+    assert (tmp_path / "__nipcache__" / "config.nip.nipc").exists()
+
+    cache = nip.DiskCache()
+    parser = Parser()
+    tree = cache.parse(parser, path)
+    assert len(list(IterParser(parser).iter_configs(tree))) == 2
+    assert parser.dependencies == [inserted.resolve()]
+    assert (cache.hits, cache.misses) == (1, 0)
+
+    _write(inserted, "value: 2", 2 * 10**18)
+    assert cache.parse(Parser(), path)["main"]["value"].to_python() == 2
+    assert cache.misses == 1
+
+
+def test_disk_cache_dir(tmp_path):
+    path = tmp_path / "config.nip"
+    _write(path, "value: 1", 10**18)
+    cache = nip.DiskCache(tmp_path / "cache")
+    cache.parse(Parser(), path)
+    os.utime(path, ns=(2 * 10**18, 2 * 10**18))  # touched but not changed
+    assert cache.parse(Parser(), path).to_python() == {"value": 1}
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
@@ -1,3 +1,5 @@
+import pytest
+
 import nip
 
 
@@ -6,3 +8,56 @@ def test_simple_load_directive():
     expected_result = nip.parse("features/directives/configs/expected_config.nip")
     assert nip.construct(result) == nip.construct(expected_result)
     # mb: not true comparison
+
+
+def test_insert_cache(tmp_path):
+    block = tmp_path / "block.nip"
+    block.write_text("size: *size\nname: block")
+    path = tmp_path / "config.nip"
+    path.write_text(
+        f'first: !!insert\n  - "{block}"\n  size: 1\n'
+        f'second: !!insert\n  - "{block}"\n  size: 2\n'
+        f'third: !!insert "{tmp_path / "nested.nip"}"'
+    )
+    (tmp_path / "nested.nip").write_text(f'inner: !!insert\n  - "{block}"\n  size: 3')
+
+    parser = nip.Parser()
+    config = parser.parse(path)
+    assert config.to_python() == {
+        "first": {"size": 1, "name": "block"},
+        "second": {"size": 2, "name": "block"},
+        "third": {"inner": {"size": 3, "name": "block"}},
+    }
+    assert len(parser.insert_cache) == 2  # block.nip is parsed once
+    for pickled, _, _ in parser.insert_cache.values():
+        assert b"Document" not in pickled
+    assert parser.include_graph == {
+        path.resolve(): [block.resolve(), (tmp_path / "nested.nip").resolve()],
+        (tmp_path / "nested.nip").resolve(): [block.resolve()],
+    }
+    assert parser.dependencies == [block.resolve(), (tmp_path / "nested.nip").resolve()]
+
+
+def test_reused_parser(tmp_path):
+    block = tmp_path / "block.nip"
+    block.write_text("size: 1")
+    path = tmp_path / "config.nip"
+    path.write_text(f'a: !!insert "{block}"')
+    parser = nip.Parser()
+    assert parser.parse(path).to_python() == {"a": {"size": 1}}
+    block.write_text("size: 10")
+    assert parser.parse(path).to_python() == {"a": {"size": 10}}
+    assert parser.dependencies == [block.resolve()]
+    assert parser.include_graph == {path.resolve(): [block.resolve()]}
+
+    assert parser.parse_string("b: 1").to_python() == {"b": 1}
+    assert parser.dependencies == [] and parser.include_graph == {}
+    assert parser.parse_string(f'b: !!insert "{path}"').to_python() == {"b": {"a": {"size": 10}}}
+
+
+def test_recursive_insert(tmp_path):
+    first, second = tmp_path / "first.nip", tmp_path / "second.nip"
+    first.write_text(f'value: !!insert "{second}"')
+    second.write_text(f'value: !!insert "{first}"')
+    with pytest.raises(nip.parser.ParserError, match="Recursive !!insert"):
+        nip.parse(first)
@@ -0,0 +1,66 @@
+import nip
+
+CONFIG = """
+model: &model !Model
+  layers: 3
+  sizes: [1, 2.5, "3"]
+  name: "model"
+trainer: !Trainer
+  model: *model
+  lr: 0.1
+"""
+REORDERED = """
+model: &model !Model
+  name: "model"
+  sizes: [1.0, 2.5, "3"]
+  layers: 3.0
+trainer: !Trainer
+  lr: 0.1
+  model: *model
+"""
+
+
+def test_equal_trees():
+    config = nip.parse_string(CONFIG)
+    assert config.fingerprint() == nip.parse_string(CONFIG).fingerprint()
+    assert config.fingerprint() == nip.parse_string(REORDERED).fingerprint()
+    assert config.fingerprint() == nip.Parser(lazy=True).parse_string(CONFIG).fingerprint()
+    assert config == nip.parse_string(REORDERED)
+    assert config["model"] == nip.parse_string(REORDERED)["model"]
+
+
+def test_different_trees():
+    fingerprint = nip.parse_string(CONFIG).fingerprint()
+    for old, new in [("!Model", "!Other"), ("*model", "*other"), ("&model", "&other"), ("0.1", "0.2"), ('"3"', "3")]:
+        changed = nip.parse_string(CONFIG.replace(old, new))
+        assert changed.fingerprint() != fingerprint
+        assert changed != nip.parse_string(CONFIG)
+
+
+def test_bools_are_not_numbers():
+    for number, boolean in [("1", "true"), ("0", "false"), ("1.0", "true"), ("[1, 0]", "[True, False]")]:
+        assert nip.parse_string(f"a: {number}") != nip.parse_string(f"a: {boolean}")
+        assert nip.parse_string(f"a: {number}").fingerprint() != nip.parse_string(f"a: {boolean}").fingerprint()
+    assert nip.parse_string("a: true") == nip.parse_string("a: True")
+
+
+def test_modification():
+    config = nip.parse_string(CONFIG)
+    fingerprint = config.fingerprint()
+    model_fingerprint = config["model"].fingerprint()
+
+    config["trainer"]["lr"] = 0.2
+    assert config.fingerprint() != fingerprint
+    assert config["model"].fingerprint() == model_fingerprint
+    config["trainer"]["lr"] = 0.1
+    assert config.fingerprint() == fingerprint
+
+    config["model"]["extra"] = 1
+    assert config.fingerprint() != fingerprint
+
+
+def test_sweeps():
+    sweep = "lr: @ [0.1, 0.2]\nbatch: @ [1, 2]\n"
+    fingerprints = [config.fingerprint() for config in nip.parse_string(sweep, always_iter=True)]
+    assert len(set(fingerprints)) == 4  # the same tree with other iterator indexes
+    assert [config.fingerprint() for config in nip.parse_string(sweep, always_iter=True)] == fingerprints
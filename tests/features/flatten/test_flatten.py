@@ -39,3 +39,84 @@ def test_complex():
     for key, value in expected_result.items():
         assert key in flattened
         assert flattened[key] == value
+
+
+def test_modified_config():
+    from nip import parse, parse_string
+
+    config = parse("features/flatten/configs/simple.nip")
+    python = config.to_python()
+    python["main"]["number"] = 100
+    python["list"][1].append(1)
+    assert config.to_python()["main"]["number"] == 1
+    assert config.to_python()["list"][1] == [123]
+
+    config["main"]["number"] = 2
+    config["list"][1].append(456)
+    flattened = config.flatten()
+    assert flattened["main.number"] == 2
+    assert flattened["list.1.1"] == 456
+    assert config.to_python()["list"][1] == [123, 456]
+
+    fork = config.fork()
+    fork["something_more.float"] = 0.5
+    assert fork.flatten()["something_more.float"] == 0.5
+    assert config.flatten()["something_more.float"] == 0.123
+
+    configs = parse_string("lr: @ [0.1, 0.2]\nmodel:\n  size: @size [1, 2]\n", always_iter=True)
+    assert [config.flatten() for config in configs] == [
+        {"lr": 0.1, "model.size": 1},
+        {"lr": 0.1, "model.size": 2},
+        {"lr": 0.2, "model.size": 1},
+        {"lr": 0.2, "model.size": 2},
+    ]
+
+
+def test_iter_flat():
+    from nip import parse
+    from nip.utils import flatten
+
+    config = next(parse("features/flatten/configs/complex.nip"))
+    assert list(config.iter_flat()) == list(flatten(config.to_python()).items())
+    assert dict(config.iter_flat("/")) == flatten(config.to_python(), "/")
+
+
+def test_unflatten():
+    import pytest
+    from nip import parse, parse_string, unflatten
+    from nip.elements import FlatError
+
+    config = parse("features/flatten/configs/simple.nip")
+    built = unflatten(config.iter_flat())
+    assert built.to_python() == config.to_python()
+    assert unflatten(config.iter_flat("/"), "/").flatten() == config.flatten()
+
+    config = parse_string("a:\n  b: 1\n  c:\n    - 1\n    - 2\nd: !T\n  e: 3\n")
+    unflatten([("a.b", 5), ("a.c.2", 3), ("d.e", 4), ("d.f.g", [1, {"x": None}]), ("new", "v")], tree=config)
+    assert config.to_python() == {
+        "a": {"b": 5, "c": [1, 2, 3]},
+        "d": {"e": 4, "f": {"g": [1, {"x": None}]}},
+        "new": "v",
+    }
+    with pytest.raises(FlatError):
+        unflatten([("a.c.5", 1)], tree=config)
+    with pytest.raises(FlatError):
+        unflatten([("a.b.c", 1)], tree=config)
+    with pytest.raises(FlatError):
+        unflatten([("a", 1), ("a.b", 2)])
+
+
+def test_node_taken_before_fork():
+    from nip import parse_string
+
+    config = parse_string("model:\n  layers:\n    size: 1\ndata: 2\n")
+    layers = config["model"]["layers"]
+    expected = config.to_python()
+    fingerprint = config.fingerprint()
+    fork = config.fork()
+    assert fork.to_python() == expected
+    layers["size"] = 5  # still shared by both trees
+    assert config.to_python()["model"]["layers"]["size"] == 5
+    assert fork.to_python()["model"]["layers"]["size"] == 5
+    assert config.fingerprint() != fingerprint
+    assert fork == config
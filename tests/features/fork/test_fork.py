@@ -0,0 +1,88 @@
+import nip
+
+CONFIG = """
+model: &model !Model
+  layers: 3
+  sizes: [1, 2]
+trainer: !Trainer
+  model: *model
+  optimizer:
+    lr: 0.1
+    momentum: 0.9
+data:
+  path: "data.csv"
+  batch: 32
+"""
+
+
+def test_fork():
+    config = nip.parse_string(CONFIG)
+    expected = config.to_python()
+    fork = config.fork()
+    fork["trainer"]["optimizer"]["lr"] = 0.01
+    fork["data.batch"] = 64
+
+    assert config.to_python() == expected
+    assert fork["trainer.optimizer.lr"].to_python() == 0.01
+    assert fork["data.batch"].to_python() == 64
+    assert fork.to_python()["model"] == expected["model"]
+    assert fork.fingerprint() != config.fingerprint()
+
+    fork["trainer.optimizer.lr"] = 0.1
+    fork["data.batch"] = 32
+    assert fork == config
+
+
+def test_shared_nodes():
+    config = nip.parse_string(CONFIG)
+    model = config._value._value[1]["model"]
+    fork = config.fork()
+    fork["trainer"]["optimizer"]["lr"] = 0.01
+    fork_kwargs = fork._value._value[1]
+    assert fork_kwargs["model"] is model  # not accessed, so not copied
+    assert fork_kwargs["data"] is config._value._value[1]["data"]
+    assert fork_kwargs["trainer"]._value._value[1]["model"] is config["trainer"]._value._value[1]["model"]
+
+
+def test_modified_original():
+    config = nip.parse_string(CONFIG)
+    fork = config.fork()
+    config["data"]["batch"] = 16
+    config["model"]["layers"] = 5
+    assert fork["data.batch"].to_python() == 32
+    assert fork["model.layers"].to_python() == 3
+    assert config["data.batch"].to_python() == 16
+
+
+def test_forks_of_fork():
+    config = nip.parse_string(CONFIG)
+    variants = []
+    for lr in [0.1, 0.2, 0.3]:
+        fork = config.fork()
+        fork["trainer.optimizer.lr"] = lr
+        variants.append(fork)
+    second = variants[1].fork()
+    second["data.path"] = "other.csv"
+    assert [variant["trainer.optimizer.lr"].to_python() for variant in variants] == [0.1, 0.2, 0.3]
+    assert variants[1]["data.path"].to_python() == "data.csv"
+    assert second["data.path"].to_python() == "other.csv"
+    assert second["trainer.optimizer.lr"].to_python() == 0.2
+
+
+def test_construct_fork():
+    import utils.builders  # noqa: F401, registers `myfunc`
+
+    config = nip.parse_string("a: &a 1\nvalue: !myfunc\n  a: *a\n  b: 2\n")
+    fork = config.fork()
+    fork["value.b"] = 3
+    assert nip.construct(config) == {"a": 1, "value": 5}
+    assert nip.construct(fork) == {"a": 1, "value": 7}
+
+
+def test_iterated_fork():
+    config = nip.parse_string("layers:\n  - size: 1\n  - size: 2\n")
+    fork = config.fork()
+    for layer in fork["layers"]:
+        layer["size"] = 9
+    assert config.to_python() == {"layers": [{"size": 1}, {"size": 2}]}
+    assert fork.to_python() == {"layers": [{"size": 9}, {"size": 9}]}
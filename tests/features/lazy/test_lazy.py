@@ -0,0 +1,59 @@
+import pytest
+
+import nip
+from nip.elements import Lazy, Args, Tag
+from nip.parser import Parser, ParserError
+
+CONFIG = """---
+model: !model_builder
+  layers: 3
+  name: "first"
+# comment
+data:
+  - 1
+  - [2, 3]
+other: &value 5
+linked: *value
+"""
+
+
+def test_sections_are_parsed_on_access():
+    tree = Parser(lazy=True).parse_string(CONFIG)
+    sections = tree._value._value[1]
+    assert isinstance(sections["model"], Lazy) and isinstance(sections["data"], Lazy)
+    assert not isinstance(sections["other"], Lazy)  # link creation is read at once
+
+    model = sections["model"]
+    assert tree["model"]["layers"].to_python() == 3
+    assert isinstance(model, Tag) and model._parent is tree._value
+    assert isinstance(sections["data"], Lazy)
+    assert tree.to_python() == Parser().parse_string(CONFIG).to_python()
+
+
+def test_construct():
+    @nip.nip
+    def model_builder(layers, name):
+        return name * layers
+
+    tree = Parser(lazy=True).parse_string(CONFIG)
+    assert nip.construct(tree["linked"]) == 5
+    assert nip.construct(tree)["model"] == "firstfirstfirst"
+
+
+def test_errors_on_access():
+    tree = Parser(lazy=True).parse_string("first: 1\nsecond:\n  a: 1\n    b: 2\n")
+    assert tree["first"].to_python() == 1
+    with pytest.raises(ParserError) as error:
+        tree["second"].to_python()
+    assert error.value.line == 3
+
+
+def test_not_a_dict():
+    tree = Parser(lazy=True).parse_string("- 1\n- 2\n")
+    assert isinstance(tree._value, Args) and tree.to_python() == [1, 2]
+
+
+def test_iterators():
+    parser = Parser(lazy=True)
+    parser.parse_string("a: @ [1, 2]\nb: 3\n")
+    assert len(parser.iterators) == 1
@@ -0,0 +1,84 @@
+import pytest
+
+import nip
+from nip.elements import OverrideError
+
+CONFIG = """
+model: &model !Model
+  layers: 3
+  sizes:
+    - 1
+    - 2
+trainer: !Trainer
+  model: *model
+  optimizer:
+    lr: 0.1
+    momentum: 0.9
+data:
+  path: "data.csv"
+  batch: 32
+"""
+
+
+def test_overrides():
+    config = nip.parse_string(CONFIG)
+    result = config.apply_overrides(
+        [
+            "trainer.optimizer.lr=0.01",
+            "data.batch = 64",
+            "data.path=other.csv",
+            "model.sizes.1=[4, 5]",
+            ("model.layers", 4),
+            "data.mode=`1 + 2`",
+        ],
+        create_missing=True,
+    )
+    assert result is config
+    python = config.to_python()
+    assert python["trainer"]["optimizer"] == {"lr": 0.01, "momentum": 0.9}
+    assert python["data"]["batch"] == 64
+    assert python["data"]["path"] == "other.csv"
+    assert python["model"]["sizes"] == [1, [4, 5]]
+    assert python["model"]["layers"] == 4
+    assert config["data.mode"].to_python() == "`1 + 2`"
+
+    config.apply_overrides({"data": {"batch": 16, "shuffle": True}, "model.sizes.2": 3}, create_missing=True)
+    assert config.to_python()["data"] == {"batch": 16, "shuffle": True}
+    assert config.to_python()["model"]["sizes"] == [1, [4, 5], 3]
+
+
+def test_same_as_setitem():
+    overrides = {"trainer.optimizer.momentum": 0.5, "model.sizes.0": "x", "data.batch": None}
+    config = nip.parse_string(CONFIG).apply_overrides(overrides)
+    expected = nip.parse_string(CONFIG)
+    for path, value in overrides.items():
+        expected[path] = value
+    assert config == expected
+
+
+def test_errors():
+    config = nip.parse_string(CONFIG)
+    expected = config.to_python()
+    with pytest.raises(OverrideError) as error:
+        config.apply_overrides(
+            [
+                "data.batch=64",
+                "data.batch.size=1",
+                "data.missing=1",
+                "model.sizes.5=1",
+                "trainer=1",
+                "trainer.optimizer.lr=2",
+                "no value",
+                "data.path=- [",
+            ]
+        )
+    assert sorted(error.value.missing) == ["Path 'data.missing' is not found", "Path 'model.sizes.5' is not found"]
+    assert len(error.value.conflicts) == 2
+    assert len(error.value.invalid) == 2
+    assert "data.missing" in str(error.value)
+    assert config.to_python() == expected
+
+    with pytest.raises(OverrideError) as error:
+        config.apply_overrides(["model.sizes.3=1"], create_missing=True)
+    assert error.value.missing == ["Path 'model.sizes.3' is not found"]
+    assert config.to_python() == expected
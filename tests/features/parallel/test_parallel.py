@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+import nip
+from nip.constructor import ConstructorError
+
+calls = []
+calls_lock = threading.Lock()
+
+
+@nip.nip("slow_load")
+def slow_load(name: str, delay: float = 0.2, fail: bool = False, source=None):
+    with calls_lock:
+        calls.append(name)
+    time.sleep(delay)
+    if fail:
+        raise ValueError(f"{name} failed")
+    return {"name": name, "source": source}
+
+
+CONFIG = """
+index: &index !slow_load
+  name: index
+reader: !slow_load
+  name: reader
+  source: *index
+tokenizer: !slow_load
+  name: tokenizer
+  source: *index
+dataset: !slow_load
+  name: dataset
+other: !slow_load
+  name: other
+"""
+
+
+def test_parallel_construction():
+    config = nip.parse_string(CONFIG)
+    calls.clear()
+    start = time.perf_counter()
+    result = nip.construct(config, workers=4)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.6  # index, then reader and tokenizer, while dataset and other are constructed at once
+    assert sorted(calls) == ["dataset", "index", "other", "reader", "tokenizer"]
+    assert result == nip.construct(config)
+    assert result["reader"]["source"] is result["tokenizer"]["source"]
+
+
+def test_first_error():
+    config = nip.parse_string(
+        "first: !slow_load\n  name: first\n  delay: 0.1\n  fail: true\n"
+        "second: !slow_load\n  name: second\n  delay: 0\n  fail: true\n"
+    )
+    for _ in range(3):
+        with pytest.raises(ConstructorError, match="first failed"):
+            nip.construct(config, workers=2)
+    with pytest.raises(ConstructorError, match="first failed"):
+        nip.construct(config)
@@ -0,0 +1,54 @@
+import pytest
+
+import nip
+from nip.parser import Parser
+
+
+def _write_configs(tmp_path, n):
+    block = tmp_path / "block.nip"
+    block.write_text("size: *size\nname: block")
+    paths = []
+    for i in range(n):
+        path = tmp_path / f"config_{i}.nip"
+        path.write_text(f'index: {i}\nblock: !!insert\n  - "{block}"\n  size: {i * 10}')
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_order_and_timings(tmp_path, processes):
+    paths = _write_configs(tmp_path, 8)
+    trees, timings = nip.parse_many(paths, workers=4, processes=processes, return_timings=True)
+    assert [tree.to_python() for tree in trees] == [
+        {"index": i, "block": {"size": i * 10, "name": "block"}} for i in range(8)
+    ]
+    assert len(timings) == 8 and all(timing >= 0 for timing in timings)
+
+
+def test_shared_inserts(tmp_path, monkeypatch):
+    paths = _write_configs(tmp_path, 4)
+    parsed = []
+    parse = Parser.parse
+
+    def counting_parse(self, path):
+        parsed.append(path)
+        return parse(self, path)
+
+    monkeypatch.setattr(Parser, "parse", counting_parse)
+    nip.parse_many(paths, workers=1)
+    assert sorted(map(str, parsed)).count(str(tmp_path / "block.nip")) == 1
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_iterators(tmp_path, processes):
+    path = tmp_path / "iter.nip"
+    path.write_text("value: @ [1, 2, 3]")
+    (configs,) = nip.parse_many([path], processes=processes)
+    assert [config.to_python() for config in configs] == [{"value": i} for i in (1, 2, 3)]
+
+
+def test_load_many(tmp_path):
+    paths = _write_configs(tmp_path, 3)
+    assert nip.load_many(paths, workers=2) == [
+        {"index": i, "block": {"size": i * 10, "name": "block"}} for i in range(3)
+    ]
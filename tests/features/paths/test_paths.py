@@ -0,0 +1,52 @@
+import pytest
+
+import nip
+
+CONFIG = """
+main:
+  other: 1
+  inner: !tag
+    value: 2
+main_other: 3
+dotted.key: 4
+dotted:
+  key: 5
+  key.deep: 6
+items:
+  - 7
+  - inner: 8
+"""
+
+
+def test_lookup():
+    config = nip.parse_string(CONFIG)
+    assert config["main.other"].to_python() == 1
+    assert config["main.inner.value"].to_python() == 2
+    assert config["main_other"].to_python() == 3  # key that starts with another one
+    assert config["dotted.key"].to_python() == 4  # key with a dot is taken as is
+    assert config["dotted.key.deep"].to_python() == 6
+    assert config["items.1.inner"].to_python() == 8
+    assert config["items"][0].to_python() == 7
+    for item in ["main.missing", "items.2", "main.other.value", "missing"]:
+        with pytest.raises(KeyError):
+            config[item]
+
+
+def test_mutation():
+    config = nip.parse_string(CONFIG)
+    config["main.other"] = 10
+    config["main.inner.new"] = 11
+    config["items.1.inner"] = 12
+    config["items"].append(13)
+    config["new.key"] = 14
+    assert config["main"]["other"].to_python() == 10
+    assert config["main.inner.new"].to_python() == 11
+    assert config["items.1.inner"].to_python() == 12
+    assert config["items.2"].to_python() == 13
+    assert config["new.key"].to_python() == 14
+    assert config["items.2"]._parent is config["items"]
+
+    config["main.other.value"] = 15  # prefix is a scalar, so the key is taken as is
+    assert config["main.other"].to_python() == 10
+    assert config["main.other.value"].to_python() == 15
+    assert "main.other.value" in config._value._value[1]
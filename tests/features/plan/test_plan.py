@@ -0,0 +1,86 @@
+import pytest
+
+import nip
+import utils.builders  # noqa: F401, registers `SimpleClass`, `myfunc` and `MyClass`
+from nip.constructor import ConstructorError
+from nip.elements import Args, Value
+from nip.non_seq_constructor import NonSequentialConstructorError
+
+CONFIG = """
+model: &model !SimpleClass
+  name: model
+result: !myfunc
+  - 1
+  - `2 * 3`
+  c: *count
+inner: !MyClass
+  name: f"{name} inner"
+  f: *model
+name: &name "config"
+count: &count 4
+"""
+
+
+def test_same_as_construct():
+    for path in [
+        "features/non_seq/configs/harder_non_seq.nip",
+        "features/non_seq/configs/inline_non_seq.nip",
+        "features/fstrings/configs/fstrings.nip",
+        "features/class_construction/configs/class_const_config.nip",
+    ]:
+        config = nip.parse(path)
+        plan = nip.compile(config)
+        assert plan() == nip.construct(config) == plan()
+
+    for config in nip.parse("features/fstrings/configs/iter_fstrings.nip"):
+        assert nip.compile(config)() == nip.construct(config)
+
+    config = nip.parse("features/non_seq/configs/harder_non_seq.nip")
+    assert nip.compile(config["other_main"])() == nip.construct(config["other_main"])
+
+
+def test_fresh_objects():
+    config = nip.parse_string(CONFIG)
+    plan = nip.compile(config)
+    first, second = plan(), plan()
+    assert first["model"] is not second["model"]
+    assert first["inner"].f is first["model"]
+    assert first["inner"].name == "config inner"
+    assert first["result"] == second["result"] == nip.construct(config)["result"] == 1 + 2 * 6 + 3 * 4
+    assert len(plan) == 6  # builders, inline python, f-string and the top-level dict
+
+
+def test_resolved_once():
+    config = nip.parse_string(CONFIG)
+    plan = nip.compile(config)
+    config["count"] = 0
+    nip.nip("SimpleClass")(lambda name: name)
+    try:
+        assert plan()["result"] == 25
+        assert isinstance(plan()["model"], utils.builders.SimpleClass)
+    finally:
+        nip.nip(utils.builders.SimpleClass)
+
+
+def test_errors():
+    config = nip.parse_string("value: !myfunc\n  a: 1\n  d: 2\n")
+    with pytest.raises(ConstructorError, match="got an unexpected keyword argument 'd'"):
+        nip.compile(config)()
+    with pytest.raises(ConstructorError, match="Constructor for Tag 'missing' is not registered"):
+        nip.compile(nip.parse_string("value: !missing 1"))()
+    with pytest.raises(ConstructorError, match="c: str is not an instance of int"):
+        nip.compile(nip.parse_string("value: !myfunc\n  a: 1\n  c: '3'\n"), strict_typing=True)()
+    with pytest.raises(NonSequentialConstructorError, match="Recursive construction"):
+        nip.compile(nip.parse("features/non_seq/configs/recursive_non_seq.nip"))
+    with pytest.raises(NonSequentialConstructorError, match="Unresolved link 'other'"):
+        nip.compile(nip.parse_string("value: *other"))
+
+
+def test_deep_tree():
+    node = Value("int", 0)
+    for _ in range(10000):
+        node = Args("args", ([], {"key": node}))
+    python = nip.compile(node)()
+    for _ in range(10000):
+        python = python["key"]
+    assert python == 0
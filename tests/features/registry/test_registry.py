@@ -0,0 +1,42 @@
+import pytest
+
+import nip
+from nip.constructor import Constructor, NIPBuilder, builders_snapshot, global_builders
+from nip.non_seq_constructor import NonSequentialConstructor
+
+
+def test_snapshot_is_shared():
+    snapshot = builders_snapshot()
+    assert builders_snapshot() is snapshot
+    assert Constructor().builders is snapshot
+    assert NonSequentialConstructor(nip.parse_string("a: 1")).builders is snapshot
+    with pytest.raises(TypeError):
+        snapshot["new"] = print
+
+
+def test_snapshot_is_updated():
+    version = global_builders.version
+    snapshot = builders_snapshot()
+
+    nip.nip("registry_builder")(lambda value: value * 2)
+    assert global_builders.version > version
+    assert "registry_builder" in builders_snapshot()
+    assert "registry_builder" not in snapshot
+    assert nip.construct(nip.parse_string("a: !registry_builder 4")) == {"a": 8}
+
+    class RegistryBuilder(NIPBuilder):
+        def __init__(self, value):
+            self.value = value
+
+    assert builders_snapshot()["RegistryBuilder"] is RegistryBuilder
+    assert nip.construct(nip.parse_string("a: !RegistryBuilder 4"))["a"].value == 4
+
+
+def test_register_copies_snapshot():
+    snapshot = builders_snapshot()
+    constructor = Constructor()
+    constructor.register(lambda: 1, "registered_locally")
+    assert "registered_locally" in constructor.builders
+    assert "registered_locally" not in builders_snapshot()
+    assert builders_snapshot() is snapshot
+    assert "registered_locally" not in Constructor().builders
@@ -0,0 +1,94 @@
+import gc
+import tracemalloc
+
+import nip
+import utils.builders  # noqa: F401, registers `SimpleClass`
+from nip.elements import walk
+
+BLOCK = "".join(f"layer_{i}:\n  size: {i}\n  activation: relu\n  dropout: 0.1\n  name: 'layer'\n" for i in range(20))
+CONFIG = """
+model: &model !SimpleClass
+  name: model
+items:
+  - !SimpleClass
+    name: item
+  - !SimpleClass
+    name: item
+types:
+  - 1
+  - 1.0
+  - true
+  - "1"
+  - 0.0
+  - -0.0
+"""
+
+
+def _insert_heavy(tmp_path, n_blocks: int = 30):
+    block = tmp_path / "block.nip"
+    block.write_text(BLOCK)
+    path = tmp_path / "config.nip"
+    path.write_text("".join(f'block_{i}: !!insert "{block}"\n' for i in range(n_blocks)))
+    return path
+
+
+def _parsed_size(path, **kwargs):
+    gc.collect()
+    tracemalloc.start()
+    tree = nip.parse(path, **kwargs)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, size
+
+
+def test_insert_heavy_memory(tmp_path):
+    path = _insert_heavy(tmp_path)
+    tree, size = _parsed_size(path)
+    shared, shared_size = _parsed_size(path, share_nodes=True)
+    assert shared_size < size / 5
+    assert len(set(map(id, walk(shared)))) < len(set(map(id, walk(tree)))) / 20
+    assert shared.to_python() == tree.to_python()
+    assert shared == tree
+    assert shared.dump_string() == tree.dump_string()
+
+
+def test_copy_on_write(tmp_path):
+    tree = nip.parse(_insert_heavy(tmp_path, 3), share_nodes=True, weak_parents=True)
+    expected = tree.to_python()
+    tree["block_1.layer_2.size"] = 100
+    tree["block_2"]["layer_2"]["activation"] = "gelu"
+    python = tree.to_python()
+    assert python["block_1"]["layer_2"] == {**expected["block_0"]["layer_2"], "size": 100}
+    assert python["block_2"]["layer_2"]["activation"] == "gelu"
+    assert python["block_0"] == expected["block_0"]
+    assert python["block_1"]["layer_3"] == expected["block_1"]["layer_3"]
+
+
+def test_values_and_construction():
+    tree = nip.parse_string(CONFIG, share_nodes=True)
+    values = tree.to_python()["types"]
+    assert [type(value) for value in values] == [int, float, bool, str, float, float]
+    assert str(values[-1]) == "-0.0"
+    items = tree._value["items"]._value[0]
+    assert items[0] is items[1]
+
+    objects = nip.construct(tree)
+    assert objects["items"][0] is not objects["items"][1]
+    assert objects["items"][0].name == objects["items"][1].name == "item"
+    assert objects["model"].name == "model"
+
+
+def test_iteration():
+    config = "a:\n  size: 1\nb:\n  size: 1\nlayers:\n  - size: 1\n  - size: 1\n"
+    tree = nip.parse_string(config, share_nodes=True)
+    tree.to_python()
+    for layer in tree["layers"]:
+        layer["size"] = 9
+    assert tree.to_python() == {"a": {"size": 1}, "b": {"size": 1}, "layers": [{"size": 9}, {"size": 9}]}
+
+    tree = nip.parse_string(config, share_nodes=True)
+    tree.to_python()
+    list(tree["layers"])[0]["size"] = 5
+    assert tree.to_python()["layers"] == [{"size": 5}, {"size": 1}]
+    assert tree == nip.parse_string(config.replace("- size: 1", "- size: 5", 1))
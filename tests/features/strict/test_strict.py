@@ -1,7 +1,16 @@
+from typing import Dict, List, Optional
+
 import pytest
 
+import nip
 from nip.constructor import ConstructorError
 from nip.parser import ParserError
+from nip.utils import check_typing
+
+
+@nip.nip("typed_items")
+def typed_items(items: List[int], mapping: Optional[Dict[str, int]] = None, name: str = ""):
+    return items, mapping, name
 
 
 def test_correct_strict():
@@ -42,6 +51,45 @@ def test_strict_names():
         load("features/strict/configs/double_names.nip", strict=True)
 
 
+def test_typing_depth():
+    for depth in ["off", "shallow", "sampled", "full"]:
+        assert check_typing(typed_items, [[1, 2]], {"mapping": {"a": 1}}, depth) == []
+        assert check_typing(typed_items, [[1, 2], None, "name", 4], {}, depth) == (
+            [] if depth == "off" else ["Too many arguments"]
+        )
+
+    assert check_typing(typed_items, ["1"], {"name": 1}, "off") == []
+    assert check_typing(typed_items, [[1, "2"]], {"mapping": {"a": "1"}}, "shallow") == []
+    messages = check_typing(typed_items, [[1, "2"]], {"mapping": {"a": "1"}}, "sampled")  # only the first items
+    assert len(messages) == 1 and messages[0].startswith("mapping: dict did not match any element in the union")
+    assert len(check_typing(typed_items, [[1, "2"]], {"mapping": {"a": "1"}}, "full")) == 2
+    assert check_typing(typed_items, [(1, 2)], {"name": 1}, "shallow") == [
+        "items: tuple is not a list",
+        "name: int is not an instance of str",
+    ]
+    with pytest.raises(ValueError, match="Unknown typing depth"):
+        check_typing(typed_items, [], {}, "deep")
+
+
+def test_bounded_checkers_cache():
+    from nip.utils import _TYPING_CHECKERS_SIZE, _cached_checkers
+
+    for i in range(_TYPING_CHECKERS_SIZE + 10):
+
+        def builder(value: int):
+            return value
+
+        assert check_typing(builder, [i], {}) == []
+    assert _cached_checkers.cache_info().currsize == _TYPING_CHECKERS_SIZE
+
+
+def test_strict_typing_depth():
+    config = nip.parse_string("main: !typed_items\n  items: [1, '2']\n")
+    assert nip.construct(config, strict_typing=True, typing_depth="shallow") == {"main": ([1, "2"], None, "")}
+    with pytest.raises(ConstructorError, match="items: item 1 of list is not an instance of int"):
+        nip.construct(config, strict_typing=True)
+
+
 # def test_wrong_args():
 #     with pytest.warns(warnings.WarningMessage,
 #                       math="Typing mismatch while constructing {self.name}"):
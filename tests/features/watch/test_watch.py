@@ -0,0 +1,86 @@
+import os
+import time
+
+from nip import Watcher, watch
+from nip.watcher import diff
+from nip import parse_string
+from nip.elements import Args, Value
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_reparse_changed_sections(tmp_path):
+    path = tmp_path / "config.nip"
+    _write(path, "model:\n  layers: 3\n  name: first\ndata:\n  - 1\n  - 2\n", 10**18)
+    calls = []
+    watcher = Watcher(path, lambda tree, changed: calls.append((tree, changed)), debounce=0)
+    data = watcher.tree["data"]
+    assert not watcher.check()
+
+    _write(path, "model:\n  layers: 4\n  name: first\ndata:\n  - 1\n  - 2\nnew: 5\n", 2 * 10**18)
+    assert watcher.check()
+    tree, changed = calls[-1]
+    assert changed == ["model.layers", "new"]
+    assert tree["data"] is data  # unchanged section is not reparsed
+    assert tree.to_python() == {"model": {"layers": 4, "name": "first"}, "data": [1, 2], "new": 5}
+
+    _write(path, "model:\n  layers: 4  # comment\n  name: first\ndata:\n  - 1\n  - 2\nnew: 5\n", 3 * 10**18)
+    assert watcher.check()
+    assert len(calls) == 1  # nothing has changed in the tree
+
+
+def test_debounce_and_errors(tmp_path):
+    path = tmp_path / "config.nip"
+    _write(path, "value: 1\n", 10**18)
+    errors = []
+    watcher = Watcher(path, lambda tree, changed: None, debounce=0.05, on_error=errors.append)
+    _write(path, "value: [1, 2\n", 2 * 10**18)
+    assert not watcher.check()  # file is checked again after debounce time
+    time.sleep(0.06)
+    assert not watcher.check()
+    assert len(errors) == 1 and watcher.tree.to_python() == {"value": 1}
+
+
+def test_inserted_files(tmp_path):
+    block = tmp_path / "block.nip"
+    _write(block, "size: 1", 10**18)
+    path = tmp_path / "config.nip"
+    _write(path, f'block: !!insert "{block}"\nother: 2\n', 10**18)
+    calls = []
+    watcher = Watcher(path, lambda tree, changed: calls.append(changed), debounce=0)
+    _write(block, "size: 2", 2 * 10**18)
+    assert watcher.check()
+    assert calls == [["block.size"]]
+    assert watcher.tree.to_python() == {"block": {"size": 2}, "other": 2}
+
+
+def test_diff():
+    old = parse_string("a:\n  - 1\n  - !tag 2\nb: 3\n")
+    new = parse_string("a:\n  - 1\n  - !other 2\n  - 4\nc: 3\n")
+    assert diff(old, new) == ["a.1", "a.2", "b", "c"]
+
+
+def test_deep_diff():
+    def deep_tree(leaf: int):
+        node = Value("int", leaf)
+        for _ in range(10000):
+            node = Args("args", ([], {"key": node}))
+        return node
+
+    assert diff(deep_tree(1), deep_tree(2)) == [".".join(["key"] * 10000)]
+    assert diff(deep_tree(1), deep_tree(1)) == []
+
+
+def test_background_thread(tmp_path):
+    path = tmp_path / "config.nip"
+    _write(path, "value: 1\n", 10**18)
+    calls = []
+    with watch(path, lambda tree, changed: calls.append(changed), interval=0.01, debounce=0):
+        _write(path, "value: 2\n", 2 * 10**18)
+        deadline = time.monotonic() + 5
+        while not calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert calls == [["value"]]